@@ -1,10 +1,14 @@
 from flask_restful import Api
-from app.api.portfolio import PortfolioAPI, AboutAPI, ContactAPI, ProjectAPI, ExperienceAPI, EducationAPI, SkillsAPI, CertificationAPI, CertificateFileAPI, ResumeAPI, TestimonialAPI, ArticleAPI, NewsletterAPI, ServicesAPI, ContactMessagesAPI
+from app.api.portfolio import PortfolioAPI, AboutAPI, ContactAPI, ProjectAPI, ExperienceAPI, EducationAPI, SkillsAPI, CertificationAPI, CertificateFileAPI, ResumeAPI, TestimonialAPI, ArticleAPI, NewsletterAPI, ServicesAPI, ContactMessagesAPI, BootstrapAPI, ResumeLinkAPI, SignedFileAPI, ImageUploadAPI, ImageFileAPI
 from app.api.auth import AuthAPI
+from app.api.uploads import UploadSessionsAPI, UploadSessionAPI, UploadFinalizeAPI
+from app.api.search import SearchAPI
+from app.utils.signed_urls import SIGNED_URL_PREFIX
 
 
 def register_routes(api: Api):
     """Register all API routes"""
+    api.add_resource(BootstrapAPI, "/api/bootstrap")
     api.add_resource(PortfolioAPI, "/api/portfolio")
     api.add_resource(AboutAPI, "/api/about")
     api.add_resource(EducationAPI, "/api/education")
@@ -15,6 +19,14 @@ def register_routes(api: Api):
     api.add_resource(CertificationAPI, "/api/certifications")
     api.add_resource(CertificateFileAPI, "/api/certificates/<string:filename>")
     api.add_resource(ResumeAPI, "/api/resume")
+    api.add_resource(ResumeLinkAPI, "/api/resume/link")
+    api.add_resource(ImageUploadAPI, "/api/images")
+    api.add_resource(ImageFileAPI, "/api/images/<string:name>")
+    api.add_resource(SearchAPI, "/api/search")
+    api.add_resource(UploadSessionsAPI, "/api/uploads")
+    api.add_resource(UploadSessionAPI, "/api/uploads/<string:upload_id>")
+    api.add_resource(UploadFinalizeAPI, "/api/uploads/<string:upload_id>/finalize")
+    api.add_resource(SignedFileAPI, f"{SIGNED_URL_PREFIX.rstrip('/')}/<path:path>")
     api.add_resource(TestimonialAPI, "/api/testimonials")
     api.add_resource(ArticleAPI, "/api/articles")
     api.add_resource(NewsletterAPI, "/api/newsletter")
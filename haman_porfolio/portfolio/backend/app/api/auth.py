@@ -1,6 +1,9 @@
+import math
 from flask_restful import Resource
 from flask import request, jsonify
 from app.utils.auth import authenticate_user, generate_token
+from app.utils.login_throttle import login_locked_for, record_login_failure, record_login_success
+from app.utils.rate_limit import get_client_ip
 from app.models import AdminUser
 
 
@@ -11,7 +14,18 @@ class AuthAPI(Resource):
         email = data.get('email')
         password = data.get('password')
 
-        if authenticate_user(email, password):
+        ip = get_client_ip()
+        locked_for = login_locked_for(email, ip)
+        if locked_for:
+            headers = {'Retry-After': str(max(1, int(math.ceil(locked_for))))}
+            return {'message': 'Too many failed login attempts. Please try again later.'}, 429, headers
+
+        authenticated = authenticate_user(email, password)
+        if authenticated is None:
+            return {'message': 'Login is busy. Please try again shortly.'}, 503, {'Retry-After': '1'}
+
+        if authenticated:
+            record_login_success(email)
             token = generate_token(email)
             return {
                 'message': 'Login successful',
@@ -19,6 +33,7 @@ class AuthAPI(Resource):
                 'email': email
             }, 200
         else:
+            record_login_failure(email, ip)
             return {'message': 'Invalid credentials'}, 401
 
     def get(self):
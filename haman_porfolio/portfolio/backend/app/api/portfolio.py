@@ -1,19 +1,33 @@
 from flask_restful import Resource, reqparse
-from flask import request, send_file
+from flask import request
 import json
 from datetime import datetime
 from decimal import Decimal
 from app import db
-from app.models import Portfolio, Skill, Education, Experience, Certification, Testimonial, Article, Project, Service, ContactMessage, Resume, NewsletterSubscriber
+from app.models import PortfolioSchema, Portfolio, Skill, Education, Experience, Certification, Testimonial, Article, Project, Service, ContactMessage, Resume, NewsletterSubscriber
 from app.models import portfolio_schema, portfolios_schema, skill_schema, skills_schema, education_schema, educations_schema, experience_schema, experiences_schema
 from app.models import certification_schema, certifications_schema, testimonial_schema, testimonials_schema, article_schema, articles_schema
 from app.models import project_schema, projects_schema, service_schema, services_schema, contact_message_schema, contact_messages_schema
 from app.models import resume_schema, resumes_schema, newsletter_subscriber_schema, newsletter_subscribers_schema
 from app.utils.auth import admin_required
 from app.utils.email import send_contact_acknowledgment_email, send_subscription_confirmation_email
+from app.utils.cache import CONTENT_SECTIONS, PORTFOLIO_SECTIONS, get_snapshot, mark_changed
+from app.utils.http_cache import conditional_get
+from app.utils.queries import PORTFOLIO_COLLECTIONS, PORTFOLIO_COLUMNS, load_portfolio_graph, load_section, read_snapshot
+from app.utils.fieldsets import fieldset_key, parse_fieldset, sparse_schema
+from app.utils.facets import ARTICLE_FACETS, PROJECT_FACETS, facet_counts, known_facet_values, load_filtered, narrow_to_known, parse_facet_filters
+from app.utils.read_models import schema_columns
+from app.utils.dates import date_criteria, date_order, parse_date_filters
+from app.utils.serializers import dump
+from app.utils.pagination import approximate_count, keyset_page
+from app.utils.rate_limit import rate_limit
+from app.utils.file_serving import UPLOAD_ROOT, get_file_metadata, serve_file, upload_relative_path
+from app.utils.storage import CERTIFICATE_URL_PREFIX, blob_path, is_blob_name, journal_blob, store_blob
+from app.utils.uploads import accept_upload
+from app.utils.images import image_file_path, image_url, register_image, release_image, srcset_for
+from app.utils.signed_urls import sign_path, signing_window, verify_signature, window_expiry
 import os
-from werkzeug.utils import secure_filename
-import uuid
+from werkzeug.utils import safe_join, secure_filename
 
 
 def get_projects_data():
@@ -24,38 +38,109 @@ def get_projects_data():
     return []
 
 
+# Returned when no portfolio has been created yet
+DEFAULT_PORTFOLIO = {
+    "id": 1,
+    "name": "Hamman Muraya",
+    "title": "Senior Software Engineer & DevOps Specialist",
+    "summary": "Highly skilled and dedicated Senior Software Engineer with over 8 years of experience designing, building, and deploying secure, scalable cloud-native systems for fintech and SaaS organisations.",
+    "about": "I am a highly skilled and dedicated Senior Software Engineer with over 8 years of experience designing, building, and deploying secure, scalable cloud-native systems for fintech and SaaS organisations. I am committed to delivering production-grade solutions that meet the highest standards of quality, security, and performance. Since beginning my professional career in software engineering in 2017, I have continuously strived to improve my technical expertise through advanced education, professional certifications, and hands-on experience across diverse technology stacks and cloud platforms. I am highly effective at leading and managing development teams, as well as working independently to prioritise and achieve project targets and business requirements. Throughout my career, I have successfully architected and delivered SOC 2-compliant microservices, optimised database performance for high-throughput systems, and implemented robust CI/CD pipelines using GitOps methodologies. I hold a PhD in Software Engineering from California State University (2019-2022), which enables me to blend academic rigor with practical, production-focused delivery.",
+    "contact": {
+        "email": "muraya.h@yahoo.com",
+        "phone": "+44-747-123-4567",
+        "linkedin": "https://linkedin.com/in/hamman-muraya-8b3744397",
+        "github": "https://github.com/MurayaSoftTouch",
+        "location": "Lincoln, Lincolnshire, England",
+        "website": "https://github.com/MurayaSoftTouch"
+    },
+    "skills": [],
+    "education": [],
+    "experience": [],
+    "certifications": [],
+    "testimonials": [],
+    "articles": [],
+    "projects": [],
+    "created_at": None,
+    "updated_at": None
+}
+
+
+def build_portfolio_document(columns=PORTFOLIO_COLUMNS, collections=PORTFOLIO_COLLECTIONS):
+    """Serialize the portfolio document, limited to the given columns and collections"""
+    only = columns + collections
+    portfolio = load_portfolio_graph(columns, collections)
+    if portfolio:
+        if only == PORTFOLIO_COLUMNS + PORTFOLIO_COLLECTIONS:
+            return dump(portfolio_schema, portfolio)
+        return dump(sparse_schema(PortfolioSchema, only), portfolio)
+    else:
+        # Return default portfolio data if none exists
+        return {key: value for key, value in DEFAULT_PORTFOLIO.items() if key in only}
+
+
+def section_response(section, model, schema, key=None, decorate=None, facets=None):
+    """Serve a section list, honouring an optional ?fields= sparse fieldset
+
+    decorate(items) may add derived values to the dumped rows; anything it
+    depends on besides the section itself must be part of key. With facets,
+    ?<facet>= filters narrow the list and the response carries facet counts.
+    Sections with typed date columns also take ?sort= and ?from= / ?to=.
+    """
+    dated = 'starts_on' in model.__table__.columns
+    try:
+        fields = parse_fieldset('fields', schema.fields)
+        sort, start, end = parse_date_filters() if dated else (None, None, None)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    selected = parse_facet_filters(facets) if facets else {}
+    unmatched = ()
+    if selected:
+        # Unknown values would each get their own cache entry and query
+        selected, unmatched = narrow_to_known(selected, known_facet_values(section, model, facets))
+
+    decorate = decorate or (lambda items: items)
+    sparse = sparse_schema(type(schema), fields, many=True) if fields else schema
+    columns = fields or schema_columns(schema)
+    criteria = date_criteria(model, start, end) if dated else []
+
+    def build():
+        rows = load_filtered(model, columns, facets or (), selected, criteria, date_order(model, sort))
+        document = {section: decorate(dump(sparse, rows))}
+        if facets:
+            document['facets'] = facet_counts(model, facets, selected, criteria)
+        return document
+
+    # Parsed dates keep "from=2021" and "from=2021-01-01" on one cache entry
+    dates = {'sort': sort and (sort,), 'from': start and (start.isoformat(),), 'to': end and (end.isoformat(),)}
+    filters = {name: values for name, values in selected.items() if name not in unmatched}
+    cache_key = fieldset_key(key or section, fields=fields, unmatched=unmatched or None, **filters, **dates)
+    return conditional_get(cache_key, (section,), build)
+
+
 class PortfolioAPI(Resource):
     def get(self):
-        """Get portfolio information"""
-        portfolio = Portfolio.query.first()
-        if portfolio:
-            return portfolio_schema.dump(portfolio)
-        else:
-            # Return default portfolio data if none exists
-            return {
-                "id": 1,
-                "name": "Hamman Muraya",
-                "title": "Senior Software Engineer & DevOps Specialist",
-                "summary": "Highly skilled and dedicated Senior Software Engineer with over 8 years of experience designing, building, and deploying secure, scalable cloud-native systems for fintech and SaaS organisations.",
-                "about": "I am a highly skilled and dedicated Senior Software Engineer with over 8 years of experience designing, building, and deploying secure, scalable cloud-native systems for fintech and SaaS organisations. I am committed to delivering production-grade solutions that meet the highest standards of quality, security, and performance. Since beginning my professional career in software engineering in 2017, I have continuously strived to improve my technical expertise through advanced education, professional certifications, and hands-on experience across diverse technology stacks and cloud platforms. I am highly effective at leading and managing development teams, as well as working independently to prioritise and achieve project targets and business requirements. Throughout my career, I have successfully architected and delivered SOC 2-compliant microservices, optimised database performance for high-throughput systems, and implemented robust CI/CD pipelines using GitOps methodologies. I hold a PhD in Software Engineering from California State University (2019-2022), which enables me to blend academic rigor with practical, production-focused delivery.",
-                "contact": {
-                    "email": "muraya.h@yahoo.com",
-                    "phone": "+44-747-123-4567",
-                    "linkedin": "https://linkedin.com/in/hamman-muraya-8b3744397",
-                    "github": "https://github.com/MurayaSoftTouch",
-                    "location": "Lincoln, Lincolnshire, England",
-                    "website": "https://github.com/MurayaSoftTouch"
-                },
-                "skills": [],
-                "education": [],
-                "experience": [],
-                "certifications": [],
-                "testimonials": [],
-                "articles": [],
-                "projects": [],
-                "created_at": None,
-                "updated_at": None
-            }
+        """Get portfolio information
+
+        ?fields= limits the top-level columns returned and ?include= the nested
+        collections. With neither the full document is returned; with only
+        ?fields= no collections are embedded.
+        """
+        try:
+            fields = parse_fieldset('fields', PORTFOLIO_COLUMNS)
+            include = parse_fieldset('include', PORTFOLIO_COLLECTIONS)
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        if fields is None and include is None:
+            return conditional_get('portfolio', PORTFOLIO_SECTIONS, build_portfolio_document)
+
+        columns = fields or PORTFOLIO_COLUMNS
+        collections = include or ()
+        return conditional_get(
+            fieldset_key('portfolio', fields=columns, include=collections),
+            ('portfolio',) + collections,
+            lambda: build_portfolio_document(columns, collections)
+        )
 
     @admin_required
     def put(self):
@@ -80,19 +165,25 @@ class PortfolioAPI(Resource):
             portfolio.about = data.get('about', portfolio.about)
             portfolio.contact = data.get('contact', portfolio.contact)
 
+        mark_changed('portfolio')
         db.session.commit()
         return portfolio_schema.dump(portfolio)
 
 
+def build_about_document():
+    """Serialize the about me section"""
+    portfolio = load_portfolio_graph(columns=('about',), collections=())
+    if portfolio:
+        portfolio_data = dump(sparse_schema(PortfolioSchema, ('about',)), portfolio)
+        return {"about": portfolio_data.get("about")}
+    else:
+        return {"about": "Default about text"}
+
+
 class AboutAPI(Resource):
     def get(self):
         """Get about me information"""
-        portfolio = Portfolio.query.first()
-        if portfolio:
-            portfolio_data = portfolio_schema.dump(portfolio)
-            return {"about": portfolio_data.get("about")}
-        else:
-            return {"about": "Default about text"}
+        return conditional_get('about', ('portfolio',), build_about_document)
 
     @admin_required
     def put(self):
@@ -106,6 +197,7 @@ class AboutAPI(Resource):
                 return {"message": "Portfolio not found"}, 404
 
             portfolio.about = about_text if about_text is not None else portfolio.about
+            mark_changed('portfolio')
             db.session.commit()
 
             # Ensure we return a clean, serializable response
@@ -119,9 +211,13 @@ class AboutAPI(Resource):
 
 class ProjectAPI(Resource):
     def get(self):
-        """Get all projects"""
-        projects = Project.query.all()
-        return {"projects": projects_schema.dump(projects)}
+        """Get all projects
+
+        ?technology=, ?category= and ?year= filter the list (comma-separate
+        alternatives); "facets" counts the projects per value of each.
+        ?sort=date|-date and ?from= / ?to= order and narrow it by year.
+        """
+        return section_response('projects', Project, projects_schema, facets=PROJECT_FACETS)
 
     @admin_required
     def post(self):
@@ -150,12 +246,14 @@ class ProjectAPI(Resource):
             technologies=technologies,
             link=data.get('link'),
             image=data.get('image'),
+            image_srcset=srcset_for(data.get('image')),
             category=category,
             year=data.get('year'),
             portfolio_id=portfolio.id
         )
 
         db.session.add(new_project)
+        mark_changed('projects')
         db.session.commit()
 
         return project_schema.dump(new_project), 201
@@ -183,7 +281,11 @@ class ProjectAPI(Resource):
         project.technologies = technologies
 
         project.link = data.get('link', project.link)
-        project.image = data.get('image', project.image)
+        replaced_image = None
+        if data.get('image', project.image) != project.image:
+            replaced_image = project.image
+            project.image = data.get('image')
+            project.image_srcset = srcset_for(project.image)
 
         # Validate category
         valid_categories = ["Software Development", "DevOps Engineering", "AI Training"]
@@ -195,7 +297,9 @@ class ProjectAPI(Resource):
 
         project.year = data.get('year', project.year)
 
+        mark_changed('projects')
         db.session.commit()
+        release_image(replaced_image)
 
         return project_schema.dump(project), 200
 
@@ -209,29 +313,38 @@ class ProjectAPI(Resource):
         if not project:
             return {"message": "Project not found"}, 404
 
+        image = project.image
         db.session.delete(project)
+        mark_changed('projects')
         db.session.commit()
+        release_image(image)
 
         return {"message": f"Project {project_id} deleted successfully"}, 200
 
 
+def build_contact_document():
+    """Serialize the contact information"""
+    portfolio = load_portfolio_graph(columns=('contact',), collections=())
+    if portfolio:
+        portfolio_data = dump(sparse_schema(PortfolioSchema, ('contact',)), portfolio)
+        return portfolio_data.get("contact", {})
+    else:
+        return {
+            "email": "muraya.h@yahoo.com",
+            "phone": "+44-747-123-4567",
+            "linkedin": "https://linkedin.com/in/hamman-muraya-8b3744397",
+            "github": "https://github.com/MurayaSoftTouch",
+            "location": "Lincoln, Lincolnshire, England",
+            "website": "https://github.com/MurayaSoftTouch"
+        }
+
+
 class ContactAPI(Resource):
     def get(self):
         """Get contact information"""
-        portfolio = Portfolio.query.first()
-        if portfolio:
-            portfolio_data = portfolio_schema.dump(portfolio)
-            return portfolio_data.get("contact", {})
-        else:
-            return {
-                "email": "muraya.h@yahoo.com",
-                "phone": "+44-747-123-4567",
-                "linkedin": "https://linkedin.com/in/hamman-muraya-8b3744397",
-                "github": "https://github.com/MurayaSoftTouch",
-                "location": "Lincoln, Lincolnshire, England",
-                "website": "https://github.com/MurayaSoftTouch"
-            }
+        return conditional_get('contact', ('portfolio',), build_contact_document)
 
+    @rate_limit('contact')
     def post(self):
         """Handle contact form submission"""
         parser = reqparse.RequestParser()
@@ -255,23 +368,22 @@ class ContactAPI(Resource):
         )
 
         db.session.add(contact_message)
-        db.session.commit()
 
-        # Send acknowledgment email to the user
-        try:
-            send_contact_acknowledgment_email(name, email, message)
-        except Exception as e:
-            # Log the error but continue with the submission
-            print(f"Error sending acknowledgment email: {str(e)}")
+        # Queue the acknowledgment email in the same transaction as the message
+        send_contact_acknowledgment_email(name, email, message)
+        db.session.commit()
 
         return contact_message_schema.dump(contact_message), 201
 
 
 class ExperienceAPI(Resource):
     def get(self):
-        """Get work experience"""
-        experiences = Experience.query.all()
-        return {"experience": experiences_schema.dump(experiences)}
+        """Get work experience
+
+        ?sort=date|-date orders positions by start; ?from= / ?to= keep those
+        overlapping the range, ongoing positions included.
+        """
+        return section_response('experience', Experience, experiences_schema)
 
     @admin_required
     def post(self):
@@ -290,6 +402,7 @@ class ExperienceAPI(Resource):
         )
 
         db.session.add(new_experience)
+        mark_changed('experience')
         db.session.commit()
 
         return experience_schema.dump(new_experience), 201
@@ -309,6 +422,7 @@ class ExperienceAPI(Resource):
         experience.period = data.get('period', experience.period)
         experience.description = data.get('description', experience.description)
 
+        mark_changed('experience')
         db.session.commit()
 
         return experience_schema.dump(experience), 200
@@ -324,6 +438,7 @@ class ExperienceAPI(Resource):
             return {"message": "Experience not found"}, 404
 
         db.session.delete(experience)
+        mark_changed('experience')
         db.session.commit()
 
         return {"message": f"Experience {exp_id} deleted successfully"}, 200
@@ -331,9 +446,11 @@ class ExperienceAPI(Resource):
 
 class EducationAPI(Resource):
     def get(self):
-        """Get education information"""
-        educations = Education.query.all()
-        return {"education": educations_schema.dump(educations)}
+        """Get education information
+
+        ?sort=date|-date and ?from= / ?to= order and narrow it by year.
+        """
+        return section_response('education', Education, educations_schema)
 
     @admin_required
     def post(self):
@@ -352,6 +469,7 @@ class EducationAPI(Resource):
         )
 
         db.session.add(new_education)
+        mark_changed('education')
         db.session.commit()
 
         return education_schema.dump(new_education), 201
@@ -371,6 +489,7 @@ class EducationAPI(Resource):
         education.year = data.get('year', education.year)
         education.description = data.get('description', education.description)
 
+        mark_changed('education')
         db.session.commit()
 
         return education_schema.dump(education), 200
@@ -386,6 +505,7 @@ class EducationAPI(Resource):
             return {"message": "Education not found"}, 404
 
         db.session.delete(education)
+        mark_changed('education')
         db.session.commit()
 
         return {"message": f"Education {edu_id} deleted successfully"}, 200
@@ -394,8 +514,7 @@ class EducationAPI(Resource):
 class SkillsAPI(Resource):
     def get(self):
         """Get skills information"""
-        skills = Skill.query.all()
-        return {"skills": skills_schema.dump(skills)}
+        return section_response('skills', Skill, skills_schema)
 
     @admin_required
     def post(self):
@@ -412,6 +531,7 @@ class SkillsAPI(Resource):
         )
 
         db.session.add(new_skill)
+        mark_changed('skills')
         db.session.commit()
 
         return skill_schema.dump(new_skill), 201
@@ -429,6 +549,7 @@ class SkillsAPI(Resource):
         skill.name = data.get('name', skill.name)
         skill.level = data.get('level', skill.level)
 
+        mark_changed('skills')
         db.session.commit()
 
         return skill_schema.dump(skill), 200
@@ -444,6 +565,7 @@ class SkillsAPI(Resource):
             return {"message": "Skill not found"}, 404
 
         db.session.delete(skill)
+        mark_changed('skills')
         db.session.commit()
 
         return {"message": f"Skill {skill_id} deleted successfully"}, 200
@@ -455,62 +577,96 @@ if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
 
+def certificate_file_path(filename):
+    """Return where an uploaded certificate is stored, or None for an invalid name"""
+    if is_blob_name(filename):
+        return blob_path(filename)
+    # Certificates uploaded before the blob store kept their own file
+    return safe_join(UPLOAD_FOLDER, filename)
+
+
+def uploaded_certificate_name(url):
+    """Return the stored file name if a certification URL points at an upload on this server"""
+    if url and url.startswith(CERTIFICATE_URL_PREFIX):
+        return url[len(CERTIFICATE_URL_PREFIX):]
+    return None
+
+
+def release_certificate_file(url):
+    """Let go of the file behind a certification URL that is being removed or replaced"""
+    filename = uploaded_certificate_name(url)
+    if not filename:
+        return
+    if is_blob_name(filename):
+        # Other records may share the blob; the GC removes it once nothing does
+        journal_blob(filename)
+        return
+    file_path = certificate_file_path(filename)
+    try:
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+    except Exception as e:
+        print(f"Error deleting file: {e}")
+
+
+def add_certificate_links(certifications, window):
+    """Add a signed, expiring file_url to certifications whose certificate was uploaded here"""
+    for certification in certifications:
+        filename = uploaded_certificate_name(certification.get('url'))
+        file_path = certificate_file_path(filename) if filename else None
+        if file_path:
+            certification['file_url'] = sign_path(upload_relative_path(file_path), window)
+    return certifications
+
+
+def create_uploaded_certification(stored_name, form):
+    """Create a certification for a stored certificate file; form holds the other fields"""
+    portfolio = Portfolio.query.first()
+    if not portfolio:
+        return {"message": "Portfolio not found"}, 404
+
+    # Without an external URL, link to the uploaded file
+    url = form.get('url') or f"{CERTIFICATE_URL_PREFIX}{stored_name}"
+
+    new_certification = Certification(
+        name=form.get('name'),
+        issuer=form.get('issuer'),
+        date=form.get('date'),
+        credential_id=form.get('credential_id'),
+        expires=form.get('expires'),
+        url=url,  # URL to the certificate
+        portfolio_id=portfolio.id
+    )
+
+    db.session.add(new_certification)
+    mark_changed('certifications')
+    db.session.commit()
+
+    return certification_schema.dump(new_certification), 201
+
+
 class CertificationAPI(Resource):
     def get(self):
-        """Get certifications"""
-        certifications = Certification.query.all()
-        return {"certifications": certifications_schema.dump(certifications)}
+        """Get certifications
+
+        ?sort=date|-date orders them by issue date; ?from= / ?to= keep those
+        valid at some point in the range.
+        """
+        # Links only change when the signing window rolls over, so the response is cached per window
+        window = signing_window()
+        return section_response('certifications', Certification, certifications_schema,
+                                key=f"certifications@{window}",
+                                decorate=lambda items: add_certificate_links(items, window))
 
     @admin_required
+    @accept_upload('certificate')
     def post(self):
         """Add certification (admin only)"""
         if 'file' in request.files:
             file = request.files['file']
             if file and file.filename != '':
-                filename = secure_filename(file.filename)
-                unique_filename = f"{str(uuid.uuid4())}_{filename}"
-                file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-                file.save(file_path)
-
-                # Get form data
-                name = request.form.get('name')
-                issuer = request.form.get('issuer')
-                date = request.form.get('date')
-                credential_id = request.form.get('credential_id')
-                expires = request.form.get('expires')
-
-                portfolio = Portfolio.query.first()
-                if not portfolio:
-                    return {"message": "Portfolio not found"}, 404
-
-                # Get form data
-                url = request.form.get('url')  # URL for the certificate
-
-                # Create certification data
-                cert_data = {
-                    "name": name,
-                    "issuer": issuer,
-                    "date": date,
-                    "credential_id": credential_id,
-                    "expires": expires,
-                    "url": url,  # URL to the certificate
-                    "file_path": unique_filename  # Store the file path
-                }
-
-                new_certification = Certification(
-                    name=cert_data["name"],
-                    issuer=cert_data["issuer"],
-                    date=cert_data["date"],
-                    credential_id=cert_data["credential_id"],
-                    expires=cert_data["expires"],
-                    url=cert_data["url"],
-                    portfolio_id=portfolio.id
-                )
-
-                db.session.add(new_certification)
-                db.session.commit()
-
-                return certification_schema.dump(new_certification), 201
+                stored_name = store_blob(file)
+                return create_uploaded_certification(stored_name, request.form)
 
         # Handle JSON data without file
         data = request.get_json()
@@ -529,6 +685,7 @@ class CertificationAPI(Resource):
         )
 
         db.session.add(new_certification)
+        mark_changed('certifications')
         db.session.commit()
 
         return certification_schema.dump(new_certification), 201
@@ -550,9 +707,11 @@ class CertificationAPI(Resource):
         certification.expires = data.get('expires', certification.expires)
 
         # Only update URL if it's provided in the request (to handle cases where column doesn't exist yet)
-        if 'url' in data:
+        if 'url' in data and data.get('url') != certification.url:
+            release_certificate_file(certification.url)
             certification.url = data.get('url')
 
+        mark_changed('certifications')
         db.session.commit()
 
         return certification_schema.dump(certification), 200
@@ -562,24 +721,17 @@ class CertificationAPI(Resource):
         """Delete certification and associated file (admin only)"""
         data = request.get_json()
         cert_id = data.get("id")
-        file_path = data.get("file_path")  # Path to the certificate file to delete
-        
-        # Delete file if it exists
-        if file_path:
-            try:
-                full_path = os.path.join(UPLOAD_FOLDER, file_path)
-                if os.path.exists(full_path):
-                    os.remove(full_path)
-            except Exception as e:
-                # Log error but continue with deletion
-                print(f"Error deleting file: {e}")
-        
+
         certification = Certification.query.get(cert_id)
         if not certification:
             return {"message": "Certification not found"}, 404
-        
+
+        # The file is found from the stored URL, never from a client-supplied path
+        url = certification.url
         db.session.delete(certification)
+        mark_changed('certifications')
         db.session.commit()
+        release_certificate_file(url)
         
         return {"message": f"Certification {cert_id} deleted successfully"}, 200
 
@@ -587,19 +739,19 @@ class CertificationAPI(Resource):
 class CertificateFileAPI(Resource):
     def get(self, filename):
         """Download certificate file"""
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
-        else:
+        file_path = certificate_file_path(filename)
+        response = serve_file(file_path) if file_path else None
+        if response is None:
             return {"message": "Certificate file not found"}, 404
+        return response
 
 
 class TestimonialAPI(Resource):
     def get(self):
         """Get testimonials"""
-        testimonials = Testimonial.query.all()
-        return {"testimonials": testimonials_schema.dump(testimonials)}
+        return section_response('testimonials', Testimonial, testimonials_schema)
 
+    @rate_limit('testimonial')
     def post(self):
         """Add testimonial (client can submit)"""
         data = request.get_json()
@@ -620,10 +772,12 @@ class TestimonialAPI(Resource):
             company=company,
             content=content,
             avatar=avatar,
+            avatar_srcset=srcset_for(avatar),
             portfolio_id=portfolio.id
         )
 
         db.session.add(new_testimonial)
+        mark_changed('testimonials')
         db.session.commit()
 
         return testimonial_schema.dump(new_testimonial), 201
@@ -642,9 +796,15 @@ class TestimonialAPI(Resource):
         testimonial.title = data.get('title', testimonial.title)
         testimonial.company = data.get('company', testimonial.company)
         testimonial.content = data.get('content', testimonial.content)
-        testimonial.avatar = data.get('avatar', testimonial.avatar)
+        replaced_avatar = None
+        if data.get('avatar', testimonial.avatar) != testimonial.avatar:
+            replaced_avatar = testimonial.avatar
+            testimonial.avatar = data.get('avatar')
+            testimonial.avatar_srcset = srcset_for(testimonial.avatar)
 
+        mark_changed('testimonials')
         db.session.commit()
+        release_image(replaced_avatar)
 
         return testimonial_schema.dump(testimonial), 200
 
@@ -658,17 +818,24 @@ class TestimonialAPI(Resource):
         if not testimonial:
             return {"message": "Testimonial not found"}, 404
 
+        avatar = testimonial.avatar
         db.session.delete(testimonial)
+        mark_changed('testimonials')
         db.session.commit()
+        release_image(avatar)
 
         return {"message": f"Testimonial {testimonial_id} deleted successfully"}, 200
 
 
 class ArticleAPI(Resource):
     def get(self):
-        """Get articles/blogs"""
-        articles = Article.query.all()
-        return {"articles": articles_schema.dump(articles)}
+        """Get articles/blogs
+
+        ?tag= and ?year= filter the list (comma-separate alternatives);
+        "facets" counts the articles per value of each. ?sort=date|-date
+        and ?from= / ?to= order and narrow it by publication date.
+        """
+        return section_response('articles', Article, articles_schema, facets=ARTICLE_FACETS)
 
     @admin_required
     def post(self):
@@ -693,6 +860,7 @@ class ArticleAPI(Resource):
         )
 
         db.session.add(new_article)
+        mark_changed('articles')
         db.session.commit()
 
         return article_schema.dump(new_article), 201
@@ -718,6 +886,7 @@ class ArticleAPI(Resource):
             tags = [tag.strip() for tag in tags.split(',')]
         article.tags = tags
 
+        mark_changed('articles')
         db.session.commit()
 
         return article_schema.dump(article), 200
@@ -733,19 +902,55 @@ class ArticleAPI(Resource):
             return {"message": "Article not found"}, 404
 
         db.session.delete(article)
+        mark_changed('articles')
         db.session.commit()
 
         return {"message": f"Article {article_id} deleted successfully"}, 200
 
 
-# Configure resume upload folder
-RESUME_UPLOAD_FOLDER = 'uploads/resume'
-if not os.path.exists(RESUME_UPLOAD_FOLDER):
-    os.makedirs(RESUME_UPLOAD_FOLDER)
+# Version section bumped whenever the resume file is replaced
+RESUME_SECTION = 'resume'
+
+
+def load_current_resume():
+    """Return the filename and path of the current resume, or None"""
+    row = db.session.query(Resume.filename, Resume.filepath).order_by(Resume.id).first()
+    if row is None:
+        return None
+    return {'filename': row.filename, 'filepath': row.filepath}
+
+
+def replace_resume(stored_name, filename):
+    """Make a stored PDF the current resume, releasing the previous file"""
+    existing_resume = Resume.query.first()
+    old_file_path = None
+    if existing_resume:
+        old_file_path = existing_resume.filepath
+        db.session.delete(existing_resume)
+
+    # Create new resume record
+    new_resume = Resume(
+        filename=secure_filename(filename or '') or 'resume.pdf',
+        filepath=blob_path(stored_name)
+    )
+
+    db.session.add(new_resume)
+    mark_changed(RESUME_SECTION)
+    db.session.commit()
+
+    if old_file_path:
+        old_name = os.path.basename(old_file_path)
+        if is_blob_name(old_name):
+            journal_blob(old_name)
+        elif os.path.exists(old_file_path):
+            os.remove(old_file_path)
+
+    return resume_schema.dump(new_resume), 201
 
 
 class ResumeAPI(Resource):
     @admin_required
+    @accept_upload('resume')
     def post(self):
         """Upload resume (admin only)"""
         if 'file' not in request.files:
@@ -756,50 +961,102 @@ class ResumeAPI(Resource):
             return {"message": "No file selected"}, 400
 
         if file and file.filename.lower().endswith('.pdf'):
-            # Generate unique filename to avoid conflicts
-            unique_filename = f"resume_{uuid.uuid4().hex}.pdf"
-            file_path = os.path.join(RESUME_UPLOAD_FOLDER, unique_filename)
-            file.save(file_path)
-
-            # Check if a resume already exists and delete the old file
-            existing_resume = Resume.query.first()
-            if existing_resume:
-                old_file_path = existing_resume.filepath
-                if os.path.exists(old_file_path):
-                    os.remove(old_file_path)
-                db.session.delete(existing_resume)
-
-            # Create new resume record
-            new_resume = Resume(
-                filename=unique_filename,
-                filepath=file_path
-            )
-
-            db.session.add(new_resume)
-            db.session.commit()
-
-            return resume_schema.dump(new_resume), 201
+            stored_name = store_blob(file)
+            return replace_resume(stored_name, file.filename)
         else:
             return {"message": "Only PDF files are allowed for resume"}, 400
 
     def get(self):
         """Download resume (public)"""
-        resume_record = Resume.query.first()
-        if resume_record and os.path.exists(resume_record.filepath):
-            return send_file(resume_record.filepath, as_attachment=True, download_name=resume_record.filename)
-        else:
+        resume_record = get_snapshot('resume', (RESUME_SECTION,), load_current_resume)
+        response = serve_file(resume_record['filepath'], resume_record['filename']) if resume_record else None
+        if response is None:
             return {"message": "Resume not available"}, 404
+        return response
+
+
+class ResumeLinkAPI(Resource):
+    def get(self):
+        """Get a signed, expiring download link for the resume (public)"""
+        resume_record = get_snapshot('resume', (RESUME_SECTION,), load_current_resume)
+        if not resume_record or get_file_metadata(resume_record['filepath']) is None:
+            return {"message": "Resume not available"}, 404
+
+        window = signing_window()
+        return {
+            "url": sign_path(upload_relative_path(resume_record['filepath']), window),
+            "filename": resume_record['filename'],
+            "expires": window_expiry(window)
+        }, 200
+
+
+class SignedFileAPI(Resource):
+    def get(self, path):
+        """Download an uploaded file through a signed link"""
+        error = verify_signature(request.path, request.args.get('expires'), request.args.get('signature'))
+        if error:
+            return {"message": error}, 403
+
+        file_path = safe_join(UPLOAD_ROOT, path)
+        response = serve_file(file_path) if file_path else None
+        if response is None:
+            return {"message": "File not found"}, 404
+        return response
+
+
+def register_uploaded_image(stored_name):
+    """Record a stored image; its resized copies are made later by image_worker.py"""
+    asset = register_image(stored_name)
+    db.session.commit()
+    return {
+        "url": image_url(stored_name),
+        "status": asset.status,
+        "srcset": asset.derivatives
+    }, 201
+
+
+class ImageUploadAPI(Resource):
+    @admin_required
+    @accept_upload('image')
+    def post(self):
+        """Upload a project image or testimonial avatar (admin only)
+
+        Use the returned url as Project.image or Testimonial.avatar. Resized
+        WebP copies appear as image_srcset / avatar_srcset once the image
+        worker has made them.
+        """
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            return {"message": "No file provided"}, 400
+        return register_uploaded_image(store_blob(file))
+
+
+class ImageFileAPI(Resource):
+    def get(self, name):
+        """Serve an uploaded image or one of its resized copies"""
+        file_path = image_file_path(name)
+        # Names are content hashes, so a URL always refers to the same bytes
+        response = serve_file(file_path, as_attachment=False, immutable=True) if file_path else None
+        if response is None:
+            return {"message": "Image not found"}, 404
+        return response
+
+
+def build_newsletter_document():
+    """Serialize the newsletter information"""
+    return {
+        "title": "Stay Updated",
+        "description": "Subscribe to my newsletter to receive updates on my latest projects, articles, and technical insights.",
+        "placeholder": "Enter your email address"
+    }
 
 
 class NewsletterAPI(Resource):
     def get(self):
         """Get newsletter information"""
-        return {
-            "title": "Stay Updated",
-            "description": "Subscribe to my newsletter to receive updates on my latest projects, articles, and technical insights.",
-            "placeholder": "Enter your email address"
-        }
+        return conditional_get('newsletter', (), build_newsletter_document)
 
+    @rate_limit('newsletter')
     def post(self):
         """Handle newsletter subscription"""
         data = request.get_json()
@@ -816,23 +1073,45 @@ class NewsletterAPI(Resource):
         # Create new subscriber
         new_subscriber = NewsletterSubscriber(email=email)
         db.session.add(new_subscriber)
-        db.session.commit()
 
-        # Send subscription confirmation email
-        try:
-            send_subscription_confirmation_email(email)
-        except Exception as e:
-            # Log error but continue with subscription
-            print(f"Error sending confirmation email: {str(e)}")
+        # Queue the confirmation email in the same transaction as the subscription
+        send_subscription_confirmation_email(email)
+        db.session.commit()
 
         return newsletter_subscriber_schema.dump(new_subscriber), 201
 
 
+# Page size of the admin inbox
+CONTACT_MESSAGES_PAGE_SIZE = int(os.environ.get('CONTACT_MESSAGES_PAGE_SIZE', '50'))
+CONTACT_MESSAGES_MAX_PAGE_SIZE = int(os.environ.get('CONTACT_MESSAGES_MAX_PAGE_SIZE', '200'))
+
+
 class ContactMessagesAPI(Resource):
+    @admin_required
     def get(self):
-        """Get all contact messages (admin only)"""
-        messages = ContactMessage.query.order_by(ContactMessage.created_at.desc()).all()
-        return {"messages": contact_messages_schema.dump(messages)}, 200
+        """Get a page of contact messages, newest first (admin only)
+
+        Pass the returned next_cursor as ?cursor= to fetch the following page.
+        """
+        parser = reqparse.RequestParser()
+        parser.add_argument('limit', type=int, location='args', default=CONTACT_MESSAGES_PAGE_SIZE)
+        parser.add_argument('cursor', type=str, location='args')
+        args = parser.parse_args()
+
+        limit = max(1, min(args['limit'], CONTACT_MESSAGES_MAX_PAGE_SIZE))
+        try:
+            messages, next_cursor = keyset_page(
+                ContactMessage.query, ContactMessage.created_at, ContactMessage.id, limit, args['cursor']
+            )
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        return {
+            "messages": dump(contact_messages_schema, messages),
+            "next_cursor": next_cursor,
+            "page_size": limit,
+            "approx_total": approximate_count(ContactMessage)
+        }, 200
 
     @admin_required
     def delete(self):
@@ -853,8 +1132,7 @@ class ContactMessagesAPI(Resource):
 class ServicesAPI(Resource):
     def get(self):
         """Get all services"""
-        services = Service.query.all()
-        return {"services": services_schema.dump(services)}, 200
+        return section_response('services', Service, services_schema)
 
     @admin_required
     def post(self):
@@ -874,6 +1152,7 @@ class ServicesAPI(Resource):
         )
 
         db.session.add(new_service)
+        mark_changed('services')
         db.session.commit()
 
         return service_schema.dump(new_service), 201
@@ -898,6 +1177,7 @@ class ServicesAPI(Resource):
             features = [feature.strip() for feature in features.split(',')]
         service.features = features
 
+        mark_changed('services')
         db.session.commit()
 
         return service_schema.dump(service), 200
@@ -913,8 +1193,36 @@ class ServicesAPI(Resource):
             return {"message": "Service not found"}, 404
 
         db.session.delete(service)
+        mark_changed('services')
         db.session.commit()
 
         return {"message": f"Service {service_id} deleted successfully"}, 200
 
 
+# Sections the public pages list in full, as their own endpoints return them, rather
+# than only the rows nested under the portfolio
+BOOTSTRAP_SECTIONS = (
+    ('projects', Project, projects_schema),
+    ('experience', Experience, experiences_schema),
+    ('testimonials', Testimonial, testimonials_schema),
+    ('articles', Article, articles_schema),
+    ('services', Service, services_schema),
+)
+
+
+def build_bootstrap_document():
+    """Serialize every public section from one consistent read snapshot"""
+    listed = {name for name, model, schema in BOOTSTRAP_SECTIONS}
+    collections = tuple(name for name in PORTFOLIO_COLLECTIONS if name not in listed)
+    with read_snapshot():
+        document = {"portfolio": build_portfolio_document(collections=collections)}
+        for name, model, schema in BOOTSTRAP_SECTIONS:
+            document[name] = dump(schema, load_section(model, schema_columns(schema)))
+        document["newsletter"] = build_newsletter_document()
+        return document
+
+
+class BootstrapAPI(Resource):
+    def get(self):
+        """Get everything the public site needs to render in one response"""
+        return conditional_get('bootstrap', CONTENT_SECTIONS, build_bootstrap_document)
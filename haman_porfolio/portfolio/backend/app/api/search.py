@@ -0,0 +1,33 @@
+from flask_restful import Resource, reqparse
+from app.utils.fieldsets import parse_fieldset
+from app.utils.rate_limit import rate_limit
+from app.utils.search import SEARCH_DEFAULT_RESULTS, SEARCH_MAX_QUERY_LENGTH, SEARCH_MAX_RESULTS, SEARCH_TYPES, search
+
+
+class SearchAPI(Resource):
+    @rate_limit('search')
+    def get(self):
+        """Search projects, articles, experience and services
+
+        ?q= takes words, "quoted phrases" and -excluded words, all of which
+        must match. ?type= limits the result types (project, article,
+        experience, service) and ?limit= the number of results. Matches in
+        each snippet are wrapped in <mark> tags; the rest is HTML-escaped.
+        """
+        parser = reqparse.RequestParser()
+        parser.add_argument('q', type=str, location='args', default='')
+        parser.add_argument('limit', type=int, location='args', default=SEARCH_DEFAULT_RESULTS)
+        args = parser.parse_args()
+
+        q = args['q'].strip()
+        if not q:
+            return {"message": "q is required"}, 400
+        if len(q) > SEARCH_MAX_QUERY_LENGTH:
+            return {"message": f"q is limited to {SEARCH_MAX_QUERY_LENGTH} characters"}, 400
+        try:
+            types = parse_fieldset('type', SEARCH_TYPES) or tuple(SEARCH_TYPES)
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        limit = max(1, min(args['limit'], SEARCH_MAX_RESULTS))
+        return {"query": q, "results": search(q, types, limit)}, 200
@@ -0,0 +1,128 @@
+from flask_restful import Resource
+from flask import request
+from app.api.portfolio import create_uploaded_certification, register_uploaded_image, replace_resume
+from app.utils.auth import admin_required
+from app.utils.upload_sessions import (
+    UPLOAD_CHUNK_MAX_SIZE, SessionBusy, append_chunk, check_session_type, create_session,
+    delete_session, finish_session, load_session, locked_session
+)
+from app.utils.uploads import UPLOAD_POLICIES
+
+
+def session_status(meta):
+    """Describe an upload session to the client"""
+    return {
+        "id": meta['id'],
+        "kind": meta['kind'],
+        "size": meta['size'],
+        "offset": meta['offset'],
+        "chunk_size": UPLOAD_CHUNK_MAX_SIZE
+    }
+
+
+class UploadSessionsAPI(Resource):
+    @admin_required
+    def post(self):
+        """Start a resumable upload of a certificate, resume or image (admin only)
+
+        Send {"kind": "certificate" | "resume" | "image", "size": <bytes>, "filename": ...},
+        then PATCH the bytes to /api/uploads/<id> and finish with
+        POST /api/uploads/<id>/finalize.
+        """
+        data = request.get_json() or {}
+        kind = data.get('kind')
+        size = data.get('size')
+
+        if kind not in UPLOAD_POLICIES:
+            return {"message": f"kind must be one of: {', '.join(UPLOAD_POLICIES)}"}, 400
+        if not isinstance(size, int) or size <= 0:
+            return {"message": "size must be a positive number of bytes"}, 400
+        if size > UPLOAD_POLICIES[kind]['max_size']:
+            return {"message": f"File exceeds the {UPLOAD_POLICIES[kind]['max_size'] // (1024 * 1024)} MB limit"}, 413
+
+        meta = create_session(kind, size, data.get('filename'))
+        return session_status(meta), 201, {'Location': f"/api/uploads/{meta['id']}"}
+
+
+class UploadSessionAPI(Resource):
+    @admin_required
+    def get(self, upload_id):
+        """Get how much of an upload has been received (admin only)"""
+        meta = load_session(upload_id)
+        if not meta:
+            return {"message": "Upload not found"}, 404
+        return session_status(meta), 200
+
+    @admin_required
+    def patch(self, upload_id):
+        """Append a chunk to an upload (admin only)
+
+        The raw body is written at the offset given in the Upload-Offset
+        header, which must equal the number of bytes received so far.
+        """
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+        except ValueError:
+            return {"message": "Upload-Offset header is required"}, 400
+
+        length = request.content_length
+        if length is None:
+            return {"message": "Content-Length header is required"}, 411
+        if length > UPLOAD_CHUNK_MAX_SIZE:
+            return {"message": f"Chunks are limited to {UPLOAD_CHUNK_MAX_SIZE} bytes"}, 413
+
+        try:
+            with locked_session(upload_id) as meta:
+                if not meta:
+                    return {"message": "Upload not found"}, 404
+                if offset != meta['offset']:
+                    return {"message": "Upload-Offset does not match the bytes received", "offset": meta['offset']}, 409
+                if offset + length > meta['size']:
+                    return {"message": "Chunk runs past the declared upload size", "offset": meta['offset']}, 413
+
+                append_chunk(meta, request.stream, length)
+                if not check_session_type(meta):
+                    types = UPLOAD_POLICIES[meta['kind']]['types']
+                    delete_session(upload_id)
+                    return {"message": f"Only {', '.join(types)} files are accepted"}, 415
+        except SessionBusy:
+            return {"message": "Another chunk of this upload is in progress"}, 409
+
+        return session_status(meta), 200, {'Upload-Offset': str(meta['offset'])}
+
+    @admin_required
+    def delete(self, upload_id):
+        """Abandon an upload (admin only)"""
+        if not load_session(upload_id):
+            return {"message": "Upload not found"}, 404
+        delete_session(upload_id)
+        return {"message": "Upload discarded"}, 200
+
+
+class UploadFinalizeAPI(Resource):
+    @admin_required
+    def post(self, upload_id):
+        """Turn a complete upload into a certification, the resume or an image (admin only)
+
+        For certificates the JSON body carries the certification fields
+        (name, issuer, date, credential_id, expires, url).
+        """
+        try:
+            with locked_session(upload_id) as meta:
+                if not meta:
+                    return {"message": "Upload not found"}, 404
+                if meta['offset'] != meta['size']:
+                    return {"message": "Upload is incomplete", "offset": meta['offset']}, 409
+                if not check_session_type(meta):
+                    delete_session(upload_id)
+                    return {"message": "Uploaded file type is not accepted"}, 415
+
+                stored_name = finish_session(meta)
+        except SessionBusy:
+            return {"message": "Another chunk of this upload is in progress"}, 409
+
+        if meta['kind'] == 'resume':
+            return replace_resume(stored_name, meta['filename'])
+        if meta['kind'] == 'image':
+            return register_uploaded_image(stored_name)
+        return create_uploaded_certification(stored_name, request.get_json(silent=True) or {})
@@ -1,9 +1,24 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from marshmallow import Schema, fields
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app.utils.dates import parse_date_range
+from app.utils.passwords import verify_password
 
 db = SQLAlchemy()
 
+# Text search configuration used for every search_vector column
+SEARCH_CONFIG = 'english'
+
+# Columns indexed for /api/search, with their PostgreSQL rank weight (A highest)
+SEARCH_DOCUMENTS = {
+    'project': (('title', 'A'), ('description', 'B')),
+    'article': (('title', 'A'), ('tags', 'A'), ('description', 'B')),
+    'experience': (('description', 'B'),),
+    'service': (('description', 'B'),),
+}
+
 # Define models
 class Portfolio(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -49,12 +64,18 @@ class Skill(db.Model):
 
 
 class Education(db.Model):
+    __table_args__ = (
+        db.Index('ix_education_starts_on_ends_on', 'starts_on', 'ends_on'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     institution = db.Column(db.String(255), nullable=False)
     degree = db.Column(db.String(255), nullable=False)
     year = db.Column(db.String(100))  # Increased length to accommodate longer values
     description = db.Column(db.Text)
     portfolio_id = db.Column(db.Integer, db.ForeignKey('portfolio.id'), nullable=False)
+    starts_on = db.Column(db.Date)  # First and last day of year, see DATE_SOURCES
+    ends_on = db.Column(db.Date)
 
     def __repr__(self):
         try:
@@ -67,12 +88,20 @@ class Education(db.Model):
 
 
 class Experience(db.Model):
+    __table_args__ = (
+        db.Index('ix_experience_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_experience_starts_on_ends_on', 'starts_on', 'ends_on'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     company = db.Column(db.String(255), nullable=False)
     period = db.Column(db.String(200))  # Increased length to accommodate longer periods
     description = db.Column(db.Text)
     portfolio_id = db.Column(db.Integer, db.ForeignKey('portfolio.id'), nullable=False)
+    starts_on = db.Column(db.Date)  # First and last day of period, see DATE_SOURCES
+    ends_on = db.Column(db.Date)
+    search_vector = db.deferred(db.Column(TSVECTOR))  # Maintained by a trigger, see SEARCH_DOCUMENTS
 
     def __repr__(self):
         try:
@@ -85,6 +114,10 @@ class Experience(db.Model):
 
 
 class Certification(db.Model):
+    __table_args__ = (
+        db.Index('ix_certification_starts_on_ends_on', 'starts_on', 'ends_on'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     issuer = db.Column(db.String(255), nullable=False)
@@ -93,6 +126,8 @@ class Certification(db.Model):
     expires = db.Column(db.String(50))
     url = db.Column(db.String(500), nullable=True)  # URL to the certificate, nullable for missing column
     portfolio_id = db.Column(db.Integer, db.ForeignKey('portfolio.id'), nullable=False)
+    starts_on = db.Column(db.Date)  # First day of date and last day of expires, see DATE_SOURCES
+    ends_on = db.Column(db.Date)
 
     def __repr__(self):
         try:
@@ -111,6 +146,7 @@ class Testimonial(db.Model):
     company = db.Column(db.String(255))
     content = db.Column(db.Text, nullable=False)
     avatar = db.Column(db.String(255))
+    avatar_srcset = db.Column(db.JSON)  # {width: url} of resized avatars, filled in by image_worker.py
     portfolio_id = db.Column(db.Integer, db.ForeignKey('portfolio.id'), nullable=False)
 
     def __repr__(self):
@@ -124,6 +160,13 @@ class Testimonial(db.Model):
 
 
 class Article(db.Model):
+    __table_args__ = (
+        db.Index('ix_article_search_vector', 'search_vector', postgresql_using='gin'),
+        # Serves ?tag= filters (array overlap)
+        db.Index('ix_article_tags', 'tags', postgresql_using='gin'),
+        db.Index('ix_article_starts_on_ends_on', 'starts_on', 'ends_on'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
@@ -131,6 +174,9 @@ class Article(db.Model):
     url = db.Column(db.String(500))
     tags = db.Column(db.ARRAY(db.String))
     portfolio_id = db.Column(db.Integer, db.ForeignKey('portfolio.id'), nullable=False)
+    starts_on = db.Column(db.Date)  # First and last day of date, see DATE_SOURCES
+    ends_on = db.Column(db.Date)
+    search_vector = db.deferred(db.Column(TSVECTOR))  # Maintained by a trigger, see SEARCH_DOCUMENTS
 
     def __repr__(self):
         try:
@@ -142,15 +188,26 @@ class Article(db.Model):
 
 
 class Project(db.Model):
+    __table_args__ = (
+        db.Index('ix_project_search_vector', 'search_vector', postgresql_using='gin'),
+        # Serves ?technology= filters (array overlap)
+        db.Index('ix_project_technologies', 'technologies', postgresql_using='gin'),
+        db.Index('ix_project_starts_on_ends_on', 'starts_on', 'ends_on'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     technologies = db.Column(db.ARRAY(db.String))
     link = db.Column(db.String(500))
     image = db.Column(db.String(255))
+    image_srcset = db.Column(db.JSON)  # {width: url} of resized images, filled in by image_worker.py
     category = db.Column(db.String(100))
     year = db.Column(db.String(20))
     portfolio_id = db.Column(db.Integer, db.ForeignKey('portfolio.id'), nullable=False)
+    starts_on = db.Column(db.Date)  # First and last day of year, see DATE_SOURCES
+    ends_on = db.Column(db.Date)
+    search_vector = db.deferred(db.Column(TSVECTOR))  # Maintained by a trigger, see SEARCH_DOCUMENTS
 
     def __repr__(self):
         try:
@@ -163,11 +220,16 @@ class Project(db.Model):
 
 
 class Service(db.Model):
+    __table_args__ = (
+        db.Index('ix_service_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     icon = db.Column(db.String(100))
     features = db.Column(db.ARRAY(db.String))
+    search_vector = db.deferred(db.Column(TSVECTOR))  # Maintained by a trigger, see SEARCH_DOCUMENTS
 
     def __repr__(self):
         try:
@@ -178,13 +240,74 @@ class Service(db.Model):
             return f"<Service(id={getattr(self, 'id', 'None')}, error='{str(e)}')>"
 
 
+def search_vector_sql(table, document):
+    """SQL computing a row's search_vector from the NEW row in a trigger"""
+    terms = []
+    for column, weight in document:
+        value = f"NEW.{column}"
+        if isinstance(table.c[column].type, db.ARRAY):
+            value = f"array_to_string({value}, ' ')"
+        terms.append(f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({value}, '')), '{weight}')")
+    return ' || '.join(terms)
+
+
+def create_search_trigger(table, connection, **kwargs):
+    """Keep search_vector up to date on tables created with db.create_all() (PostgreSQL only)
+
+    Migrations create the same trigger for existing databases.
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    document = SEARCH_DOCUMENTS[table.name]
+    connection.exec_driver_sql(
+        f"CREATE OR REPLACE FUNCTION {table.name}_search_vector_update() RETURNS trigger AS $$\n"
+        f"BEGIN\n    NEW.search_vector := {search_vector_sql(table, document)};\n    RETURN NEW;\nEND\n$$ LANGUAGE plpgsql"
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER {table.name}_search_vector_update "
+        f"BEFORE INSERT OR UPDATE OF {', '.join(column for column, weight in document)} ON {table.name} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table.name}_search_vector_update()"
+    )
+
+
+for _model in (Project, Article, Experience, Service):
+    event.listen(_model.__table__, 'after_create', create_search_trigger)
+
+
+# Free-text columns starts_on and ends_on are parsed from: (start source, end source)
+DATE_SOURCES = {
+    Article: ('date', 'date'),
+    Certification: ('date', 'expires'),
+    Education: ('year', 'year'),
+    Experience: ('period', 'period'),
+    Project: ('year', 'year'),
+}
+
+
+def fill_date_range(mapper, connection, target):
+    """Keep starts_on/ends_on in step with the free-text dates on every ORM insert and update"""
+    start_source, end_source = DATE_SOURCES[type(target)]
+    target.starts_on = parse_date_range(getattr(target, start_source))[0]
+    target.ends_on = parse_date_range(getattr(target, end_source))[1]
+
+
+for _model in DATE_SOURCES:
+    event.listen(_model, 'before_insert', fill_date_range)
+    event.listen(_model, 'before_update', fill_date_range)
+
+
 class ContactMessage(db.Model):
+    __table_args__ = (
+        # Supports keyset pagination of the admin inbox (newest first)
+        db.Index('ix_contact_message_created_at_id', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     email = db.Column(db.String(255), nullable=False)
     subject = db.Column(db.String(255))
     message = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     def __repr__(self):
         try:
@@ -211,6 +334,20 @@ class Resume(db.Model):
             return f"<Resume(id={getattr(self, 'id', 'None')}, error='{str(e)}')>"
 
 
+class ContentVersion(db.Model):
+    section = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        try:
+            section = getattr(self, 'section', 'Unknown')
+            version = getattr(self, 'version', 'Unknown')
+            return f"<ContentVersion(section='{section}', version={version})>"
+        except Exception as e:
+            return f"<ContentVersion(error='{str(e)}')>"
+
+
 # Marshmallow schemas for serialization
 class SkillSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -251,6 +388,7 @@ class TestimonialSchema(Schema):
     company = fields.Str()
     content = fields.Str(required=True)
     avatar = fields.Str()
+    avatar_srcset = fields.Dict(keys=fields.Str(), values=fields.Str(), dump_only=True)
 
 
 class ArticleSchema(Schema):
@@ -269,6 +407,7 @@ class ProjectSchema(Schema):
     technologies = fields.List(fields.Str())
     link = fields.Url()
     image = fields.Str()
+    image_srcset = fields.Dict(keys=fields.Str(), values=fields.Str(), dump_only=True)
     category = fields.Str()
     year = fields.Str()
 
@@ -334,8 +473,7 @@ class AdminUser(db.Model):
 
     def check_password(self, password):
         """Check if provided password matches the stored hash"""
-        from werkzeug.security import check_password_hash
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
 
 # Newsletter subscriber model
@@ -352,6 +490,60 @@ class NewsletterSubscriber(db.Model):
             return f"<NewsletterSubscriber(id={getattr(self, 'id', 'None')}, error='{str(e)}')>"
 
 
+# Outgoing email, written in the same transaction as the record that triggers it
+class EmailOutbox(db.Model):
+    __table_args__ = (
+        # Lets workers find due messages without scanning delivered ones
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    is_html = db.Column(db.Boolean, nullable=False, default=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        try:
+            to_email = getattr(self, 'to_email', 'Unknown')
+            status = getattr(self, 'status', 'Unknown')
+            return f"<EmailOutbox(id={getattr(self, 'id', 'None')}, to_email='{to_email}', status='{status}')>"
+        except Exception as e:
+            return f"<EmailOutbox(id={getattr(self, 'id', 'None')}, error='{str(e)}')>"
+
+
+class ImageAsset(db.Model):
+    __table_args__ = (
+        # Lets workers find images waiting for derivatives without scanning finished ones
+        db.Index('ix_image_asset_status_created_at', 'status', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    original = db.Column(db.String(100), unique=True, nullable=False)  # Blob name of the uploaded image
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, ready, failed
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    derivatives = db.Column(db.JSON)  # {width: url} of the resized copies
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        try:
+            original = getattr(self, 'original', 'Unknown')
+            status = getattr(self, 'status', 'Unknown')
+            return f"<ImageAsset(id={getattr(self, 'id', 'None')}, original='{original}', status='{status}')>"
+        except Exception as e:
+            return f"<ImageAsset(id={getattr(self, 'id', 'None')}, error='{str(e)}')>"
+
+
 # Admin user schema
 class AdminUserSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -1,10 +1,30 @@
 import jwt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify
 from datetime import datetime, timedelta
 import os
-from werkzeug.security import check_password_hash, generate_password_hash
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 from app.models import AdminUser, db
+from app.utils.cache import get_generation, mark_changed
+from app.utils.login_throttle import LOGIN_HASH_WAIT, hash_slots, last_logins
+from app.utils.passwords import hash_password, needs_rehash
+
+
+SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
+
+# Verified token -> admin identity cache. Entries expire after the TTL, when the
+# token itself expires, or as soon as any admin's credentials or status change.
+ADMIN_TOKEN_CACHE_TTL = float(os.environ.get('ADMIN_TOKEN_CACHE_TTL', 60))
+ADMIN_TOKEN_CACHE_SIZE = int(os.environ.get('ADMIN_TOKEN_CACHE_SIZE', 256))
+ADMIN_USERS_SECTION = 'admin_users'
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
 
 
 def generate_token(email):
@@ -14,22 +34,81 @@ def generate_token(email):
         'exp': datetime.utcnow() + timedelta(days=30),  # Token expires in 30 days
         'iat': datetime.utcnow()
     }
-    secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
-    return jwt.encode(payload, secret_key, algorithm='HS256')
+    return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
 
 
-def verify_token(token):
-    """Verify JWT token and return email if valid"""
+def decode_token(token):
+    """Verify JWT token and return its payload if valid"""
     try:
-        secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
-        payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-        return payload['email']
+        return jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
 
+def verify_token(token):
+    """Verify JWT token and return email if valid"""
+    payload = decode_token(token)
+    return payload['email'] if payload else None
+
+
+def clear_token_cache():
+    """Forget every cached token verification in this worker"""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+def get_admin_email(token):
+    """Return the email of the active admin the token belongs to, or None.
+
+    Successful lookups are cached so repeated requests with the same token skip
+    both the JWT decode and the AdminUser query.
+    """
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    generation = get_generation((ADMIN_USERS_SECTION,))
+    now = time.time()
+
+    cached = _token_cache.get(key)
+    if cached is not None and generation is not None:
+        email, expires_at, cached_generation = cached
+        if expires_at > now and cached_generation == generation:
+            return email
+
+    payload = decode_token(token)
+    if not payload:
+        return None
+
+    # Check if the user exists and is active
+    admin_user = AdminUser.query.filter_by(email=payload['email'], is_active=True).first()
+    if not admin_user:
+        return None
+
+    if generation is not None:
+        expires_at = min(now + ADMIN_TOKEN_CACHE_TTL, payload.get('exp', now))
+        with _token_cache_lock:
+            _token_cache[key] = (admin_user.email, expires_at, generation)
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > ADMIN_TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return admin_user.email
+
+
+@event.listens_for(Session, 'before_flush')
+def _invalidate_admin_tokens(session, flush_context, instances):
+    """Bump the admin_users version when an admin is deactivated, removed or gets a new password"""
+    changed = any(isinstance(obj, AdminUser) for obj in session.deleted)
+    for obj in session.dirty:
+        if changed:
+            break
+        if isinstance(obj, AdminUser):
+            state = inspect(obj)
+            changed = any(state.attrs[name].history.has_changes() for name in ('password_hash', 'is_active', 'email'))
+    if changed:
+        mark_changed(ADMIN_USERS_SECTION)
+        clear_token_cache()
+
+
 def admin_required(f):
     """Decorator to require admin authentication"""
     @wraps(f)
@@ -46,13 +125,9 @@ def admin_required(f):
         if not token:
             return {'message': 'Token is missing'}, 401
 
-        email = verify_token(token)
-        if not email:
-            return {'message': 'Token is invalid'}, 401
-
-        # Check if the user exists and is active
-        admin_user = AdminUser.query.filter_by(email=email, is_active=True).first()
-        if not admin_user:
+        if get_admin_email(token) is None:
+            if not verify_token(token):
+                return {'message': 'Token is invalid'}, 401
             return {'message': 'Access denied. Admin privileges required.'}, 403
 
         return f(*args, **kwargs)
@@ -61,19 +136,38 @@ def admin_required(f):
 
 
 def authenticate_user(email, password):
-    """Authenticate admin user"""
+    """Authenticate admin user.
+
+    Returns None rather than False when no password check slot freed up in
+    time, so the caller can ask the client to retry.
+    """
     admin_user = AdminUser.query.filter_by(email=email).first()
-    if admin_user and admin_user.is_active and admin_user.check_password(password):
-        # Update last login time
-        admin_user.last_login = datetime.utcnow()
-        db.session.commit()
-        return True
-    return False
+    if not admin_user or not admin_user.is_active:
+        return False
+
+    with hash_slots.acquire(LOGIN_HASH_WAIT) as acquired:
+        if not acquired:
+            return None
+        valid = admin_user.check_password(password)
+        if valid and needs_rehash(admin_user.password_hash):
+            # Upgrade hashes made with an older algorithm or cost while the password is at hand.
+            # The password itself is unchanged, so this is a bulk UPDATE that skips the
+            # before_flush listener instead of invalidating every cached admin token; it
+            # only applies if the hash was not changed in the meantime.
+            AdminUser.query.filter_by(id=admin_user.id, password_hash=admin_user.password_hash).update(
+                {AdminUser.password_hash: hash_password(password)}, synchronize_session=False
+            )
+            db.session.commit()
+
+    if valid:
+        # Last login times are written in batches instead of a commit per login
+        last_logins.record(admin_user.id, datetime.utcnow())
+    return valid
 
 
 def create_admin_user(email, password):
     """Create a new admin user with hashed password"""
-    password_hash = generate_password_hash(password)
+    password_hash = hash_password(password)
     admin_user = AdminUser(email=email, password_hash=password_hash)
     db.session.add(admin_user)
     db.session.commit()
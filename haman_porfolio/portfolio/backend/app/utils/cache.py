@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from app.models import db, ContentVersion
+
+
+# Sections the public portfolio document is assembled from
+PORTFOLIO_SECTIONS = (
+    'portfolio', 'skills', 'education', 'experience',
+    'certifications', 'testimonials', 'articles', 'projects'
+)
+
+# Every section an admin can edit
+CONTENT_SECTIONS = PORTFOLIO_SECTIONS + ('services',)
+
+# How long (in seconds) a worker trusts its copy of the version table before
+# re-reading it. Writes made by this worker are visible immediately; writes
+# made by other workers become visible after at most this long.
+VERSION_CHECK_INTERVAL = float(os.environ.get('CONTENT_VERSION_CHECK_INTERVAL', '1.0'))
+
+# Maximum number of snapshots kept per worker; the least recently used are dropped first
+SNAPSHOT_CACHE_SIZE = int(os.environ.get('SNAPSHOT_CACHE_SIZE', '256'))
+
+_lock = threading.Lock()
+_versions = {}
+_versions_loaded_at = None
+_snapshots = OrderedDict()
+
+
+def load_versions():
+    """Return the current {section: (version, updated_at)} map, or None if it can't be read"""
+    global _versions, _versions_loaded_at
+
+    now = time.monotonic()
+    loaded_at = _versions_loaded_at
+    if loaded_at is not None and now - loaded_at < VERSION_CHECK_INTERVAL:
+        return _versions
+
+    try:
+        rows = db.session.query(ContentVersion.section, ContentVersion.version, ContentVersion.updated_at).all()
+    except Exception as e:
+        # The version table may not exist yet (e.g. before migrations run)
+        db.session.rollback()
+        print(f"Error loading content versions: {str(e)}")
+        return None
+
+    versions = {section: (version, updated_at) for section, version, updated_at in rows}
+    with _lock:
+        _versions = versions
+        _versions_loaded_at = now
+    return versions
+
+
+def get_generation(sections):
+    """Return a tuple identifying the current content of the given sections"""
+    versions = load_versions()
+    if versions is None:
+        return None
+    return tuple(versions.get(section, (0, None))[0] for section in sections)
+
+
+def get_last_modified(sections):
+    """Return the most recent update time across the given sections, or None if unknown"""
+    versions = load_versions()
+    if not versions:
+        return None
+    timestamps = [versions[section][1] for section in sections if section in versions and versions[section][1]]
+    return max(timestamps) if timestamps else None
+
+
+def get_snapshot(key, sections, builder, generation=None):
+    """Return the cached value for key, calling builder() again only when one of its sections changed.
+
+    The generation is read before building, so a write that lands mid-build
+    leaves the snapshot tagged with the older generation and it is rebuilt on
+    the next request.
+    """
+    if generation is None:
+        generation = get_generation(sections)
+    if generation is None:
+        return builder()
+
+    cached = _snapshots.get(key)
+    if cached is not None and cached[0] == generation:
+        with _lock:
+            if key in _snapshots:
+                _snapshots.move_to_end(key)
+        return cached[1]
+
+    value = builder()
+    with _lock:
+        _snapshots[key] = (generation, value)
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > SNAPSHOT_CACHE_SIZE:
+            _snapshots.popitem(last=False)
+    return value
+
+
+def mark_changed(*sections):
+    """Bump the version of each section as part of the current transaction.
+
+    Call this before db.session.commit() in every handler that writes content.
+    """
+    global _versions_loaded_at
+
+    now = datetime.utcnow()
+    for section in sections:
+        updated = ContentVersion.query.filter_by(section=section).update(
+            {ContentVersion.version: ContentVersion.version + 1, ContentVersion.updated_at: now},
+            synchronize_session=False
+        )
+        if not updated:
+            db.session.add(ContentVersion(section=section, version=1, updated_at=now))
+
+    # Make the next read in this worker go back to the version table
+    _versions_loaded_at = None
+
+
+def clear_snapshots():
+    """Drop every cached snapshot held by this worker"""
+    global _versions_loaded_at
+    with _lock:
+        _snapshots.clear()
+        _versions_loaded_at = None
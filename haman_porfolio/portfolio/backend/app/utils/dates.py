@@ -0,0 +1,156 @@
+import calendar
+import re
+from datetime import date
+from flask import request
+from sqlalchemy import nulls_last, or_
+
+
+# Free-text dates in the portfolio look like "October 20, 2023", "January 2025",
+# "07/2023 – 07/2025" or "2019-2022". parse_date_range() turns them into the
+# first and last day they cover, which are stored in the starts_on / ends_on
+# columns so lists can be sorted and filtered by date in the database.
+
+MONTHS = {}
+for _number in range(1, 13):
+    MONTHS[calendar.month_name[_number].lower()] = _number
+    MONTHS[calendar.month_abbr[_number].lower()] = _number
+MONTHS['sept'] = 9
+
+# Words meaning a range has no end yet
+OPEN_ENDED = {'present', 'current', 'now', 'ongoing', 'today'}
+
+RANGE_SEPARATOR = re.compile(r'\s*(?:–|—|\bto\b|\buntil\b|\s-\s|-(?=\s*[A-Za-z]|\d{4}\b))\s*', re.IGNORECASE)
+
+DATE_PATTERNS = (
+    # 2023-10-20
+    (re.compile(r'^(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$'), 'day'),
+    # 2023-10, 10/2023, 10.2023
+    (re.compile(r'^(?P<year>\d{4})-(?P<month>\d{1,2})$'), 'month'),
+    (re.compile(r'^(?P<month>\d{1,2})[/.](?P<year>\d{4})$'), 'month'),
+    # October 20, 2023 / Oct 20 2023
+    (re.compile(r'^(?P<month_name>[A-Za-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})$'), 'day'),
+    # 20 October 2023
+    (re.compile(r'^(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<month_name>[A-Za-z]+)\.?,?\s+(?P<year>\d{4})$'), 'day'),
+    # January 2025 / Jan. 2025
+    (re.compile(r'^(?P<month_name>[A-Za-z]+)\.?,?\s+(?P<year>\d{4})$'), 'month'),
+    # 2024
+    (re.compile(r'^(?P<year>\d{4})$'), 'year'),
+)
+
+
+def parse_date_bounds(text):
+    """Return the (first, last) day of a single free-text date, or None if it isn't one"""
+    text = (text or '').strip().rstrip('.')
+    for pattern, precision in DATE_PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+
+        parts = match.groupdict()
+        year = int(parts['year'])
+        if parts.get('month_name'):
+            month = MONTHS.get(parts['month_name'].lower())
+            if month is None:
+                return None
+        else:
+            month = int(parts.get('month') or 1)
+
+        try:
+            if precision == 'year':
+                return date(year, 1, 1), date(year, 12, 31)
+            if precision == 'month':
+                return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+            day = date(year, month, int(parts['day']))
+            return day, day
+        except ValueError:  # e.g. month 13 or February 30
+            return None
+    return None
+
+
+def parse_date_range(text):
+    """Return the first and last day covered by a free-text date or date range.
+
+    "October 20, 2023" covers one day, "January 2025" a month, "2019-2022"
+    four years. An open range ("Jan 2020 – Present") has no last day.
+    Unparseable text gives (None, None).
+    """
+    whole = parse_date_bounds(text)
+    if whole:
+        return whole
+
+    parts = RANGE_SEPARATOR.split((text or '').strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None, None
+
+    start = parse_date_bounds(parts[0])
+    if start is None:
+        return None, None
+    if parts[1].strip().lower() in OPEN_ENDED:
+        return start[0], None
+    end = parse_date_bounds(parts[1])
+    if end is None or end[1] < start[0]:
+        return None, None
+    return start[0], end[1]
+
+
+# ?sort= values accepted by dated list endpoints -> (column, descending)
+DATE_SORTS = {
+    'date': ('starts_on', False),
+    '-date': ('starts_on', True),
+    'id': ('id', False),
+    '-id': ('id', True),
+}
+
+
+def parse_date_filters():
+    """Read ?sort=, ?from= and ?to= from the query string as (sort, start, end).
+
+    from and to take any single date parse_date_bounds understands: from=2021
+    starts on 1 January 2021, to=2022-06 ends on 30 June 2022. Absent
+    parameters are None; invalid ones raise ValueError.
+    """
+    sort = request.args.get('sort')
+    if sort is not None and sort not in DATE_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(DATE_SORTS)}")
+
+    bounds = {}
+    for param, index in (('from', 0), ('to', 1)):
+        raw = request.args.get(param)
+        if raw is None:
+            bounds[param] = None
+            continue
+        parsed = parse_date_bounds(raw)
+        if parsed is None:
+            raise ValueError(f"{param} must be a date like 2023, 2023-10 or 2023-10-20")
+        bounds[param] = parsed[index]
+
+    if bounds['from'] and bounds['to'] and bounds['from'] > bounds['to']:
+        raise ValueError("from must not be after to")
+    return sort, bounds['from'], bounds['to']
+
+
+def date_criteria(model, start, end):
+    """Conditions keeping rows whose date range overlaps start..end.
+
+    Rows with no parseable date never match a range; open-ended ones (no
+    ends_on) run up to today and beyond.
+    """
+    criteria = []
+    if start:
+        criteria.append(model.starts_on.is_not(None))
+        criteria.append(or_(model.ends_on.is_(None), model.ends_on >= start))
+    if end:
+        criteria.append(model.starts_on <= end)
+    return criteria
+
+
+def date_order(model, sort):
+    """ORDER BY clauses for a ?sort= value, or None for the default id order"""
+    if sort is None:
+        return None
+    column, descending = DATE_SORTS[sort]
+    column = getattr(model, column)
+    if column is model.id:
+        return (column.desc() if descending else column,)
+    # Undated rows go last either way; id keeps rows on the same date stable
+    return (nulls_last(column.desc() if descending else column), model.id.desc() if descending else model.id)
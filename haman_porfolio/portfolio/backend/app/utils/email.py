@@ -1,47 +1,204 @@
 import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from flask import current_app
+from app.models import db, EmailOutbox
 import os
 
 
+# SMTP configuration from environment variables
+SMTP_SERVER = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', 587))
+SMTP_USERNAME = os.environ.get('SMTP_USERNAME', 'default@example.com')  # Using default email as fallback
+SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', '')  # Should be set in environment
+# Set SMTP_USE_TLS=False (and leave SMTP_PASSWORD empty) to talk to a local
+# stand-in such as `python -m aiosmtpd -n -l localhost:1025`
+SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', 'True').lower() == 'true'
+SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', 10))
+SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', 2))
+SMTP_IDLE_TIMEOUT = float(os.environ.get('SMTP_IDLE_TIMEOUT', 60))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_BACKOFF = float(os.environ.get('EMAIL_OUTBOX_RETRY_BACKOFF', 30))
+# Seconds a claimed outbox row is reserved for its worker; keep it above
+# batch size x SMTP_TIMEOUT so a slow batch is not picked up twice
+EMAIL_OUTBOX_LEASE = float(os.environ.get('EMAIL_OUTBOX_LEASE', 600))
+
+
+def build_message(to_email, subject, body, is_html=False):
+    """Build the MIME message for an email"""
+    msg = MIMEMultipart()
+    msg['From'] = SMTP_USERNAME
+    msg['To'] = to_email
+    msg['Subject'] = subject
+
+    # Add body to email
+    if is_html:
+        msg.attach(MIMEText(body, 'html'))
+    else:
+        msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def is_transient_error(error):
+    """Check whether a failed send is worth retrying"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 4xx replies are temporary, 5xx replies are permanent
+        return not 500 <= error.smtp_code < 600
+    # Disconnects, timeouts and other socket errors
+    return True
+
+
+class SMTPConnectionPool:
+    """A small pool of authenticated SMTP sessions reused across outbox deliveries"""
+
+    def __init__(self, size=SMTP_POOL_SIZE):
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        """Open, secure and log in a new SMTP session"""
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            if SMTP_USE_TLS:
+                server.starttls()  # Enable security
+            if SMTP_PASSWORD:
+                server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    def _close(self, server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def acquire(self):
+        """Return a live session, reusing an idle one when possible"""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    return self._connect()
+                server, released_at = entry
+                if time.monotonic() - released_at < SMTP_IDLE_TIMEOUT:
+                    try:
+                        # Make sure the server hasn't dropped the session
+                        if server.noop()[0] == 250:
+                            return server
+                    except smtplib.SMTPException:
+                        pass
+                self._close(server)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, server, broken=False):
+        """Return a session to the pool, or discard it if it failed"""
+        try:
+            if broken:
+                self._close(server)
+            else:
+                with self._lock:
+                    self._idle.append((server, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close_all(self):
+        """Close every idle session"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+_pool = SMTPConnectionPool()
+
+
+def send_once(to_email, subject, body, is_html=False):
+    """Make a single delivery attempt over a pooled SMTP session, raising on failure"""
+    text = build_message(to_email, subject, body, is_html).as_string()
+    server = _pool.acquire()
+    try:
+        server.sendmail(SMTP_USERNAME, to_email, text)
+    except Exception as e:
+        # A refused recipient leaves the session usable
+        _pool.release(server, broken=not isinstance(e, smtplib.SMTPRecipientsRefused))
+        raise
+    _pool.release(server)
+
+
 def send_email(to_email, subject, body, is_html=False):
     """
-    Send an email using SMTP
+    Queue an email for delivery by email_worker.py; never blocks on SMTP
+
+    The email is added to the current database session as an EmailOutbox row,
+    so it is committed (or rolled back) together with the caller's changes.
+    Nothing is sent until the caller commits.
     """
-    try:
-        # Get SMTP configuration from environment variables
-        smtp_server = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
-        smtp_port = int(os.environ.get('SMTP_PORT', 587))
-        smtp_username = os.environ.get('SMTP_USERNAME', 'default@example.com')  # Using default email as fallback
-        smtp_password = os.environ.get('SMTP_PASSWORD', '')  # Should be set in environment
-
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = smtp_username
-        msg['To'] = to_email
-        msg['Subject'] = subject
-
-        # Add body to email
-        if is_html:
-            msg.attach(MIMEText(body, 'html'))
-        else:
-            msg.attach(MIMEText(body, 'plain'))
+    db.session.add(EmailOutbox(to_email=to_email, subject=subject, body=body, is_html=is_html))
+    return True
 
-        # Create SMTP session
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # Enable security
-        server.login(smtp_username, smtp_password)
 
-        # Send email
-        text = msg.as_string()
-        server.sendmail(smtp_username, to_email, text)
-        server.quit()
+def _record_outcome(item_id, values):
+    """Write one email's delivery outcome in its own short transaction"""
+    EmailOutbox.query.filter(EmailOutbox.id == item_id).update(values, synchronize_session=False)
+    db.session.commit()
 
-        return True
-    except Exception as e:
-        print(f"Error sending email: {str(e)}")
-        return False
+
+def drain_outbox(batch_size=20):
+    """
+    Deliver one batch of due outbox emails and return how many rows were processed
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased by
+    moving next_attempt_at EMAIL_OUTBOX_LEASE seconds ahead; the claim is
+    committed before any SMTP traffic, so no row locks are held while
+    sending. Each outcome is committed as soon as it is known, so a crash
+    only puts the unsent rest of the batch back, once the lease runs out.
+    """
+    now = datetime.utcnow()
+    batch = (
+        EmailOutbox.query
+        .filter(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    claimed = []
+    for item in batch:
+        item.attempts += 1
+        item.next_attempt_at = now + timedelta(seconds=EMAIL_OUTBOX_LEASE)
+        claimed.append((item.id, item.attempts, item.to_email, item.subject, item.body, item.is_html))
+    # Releases the row locks; the lease keeps other workers off these rows
+    db.session.commit()
+
+    for item_id, attempts, to_email, subject, body, is_html in claimed:
+        try:
+            send_once(to_email, subject, body, is_html)
+        except Exception as e:
+            if is_transient_error(e) and attempts < EMAIL_OUTBOX_MAX_ATTEMPTS:
+                delay = EMAIL_OUTBOX_RETRY_BACKOFF * (2 ** (attempts - 1))
+                outcome = {'last_error': str(e), 'next_attempt_at': datetime.utcnow() + timedelta(seconds=delay)}
+            else:
+                outcome = {'last_error': str(e), 'status': 'failed'}
+                print(f"Giving up on email {item_id} to {to_email}: {str(e)}")
+        else:
+            outcome = {'status': 'sent', 'sent_at': datetime.utcnow(), 'last_error': None}
+        _record_outcome(item_id, outcome)
+
+    return len(claimed)
 
 
 def send_subscription_confirmation_email(email):
@@ -83,7 +240,7 @@ def send_contact_acknowledgment_email(name, email, message):
 
 def send_resume_download_link(email, download_link):
     """
-    Send an email with resume download link
+    Send an email with resume download link; delivered once the caller commits
     """
     subject = "Your Requested Resume Download Link"
     body = f"""
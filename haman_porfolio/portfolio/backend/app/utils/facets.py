@@ -0,0 +1,161 @@
+from collections import Counter
+from flask import request
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import array
+from app.models import db
+from app.utils.cache import get_snapshot
+from app.utils.read_models import read_rows
+
+
+class Facet:
+    """A section attribute that list endpoints can filter on and count.
+
+    `column` may be an array column, whose rows match any of their values,
+    or with by_year a date column, whose rows are counted per year.
+    """
+
+    def __init__(self, name, column, is_array=False, by_year=False):
+        self.name = name
+        self.column = column
+        self.is_array = is_array
+        self.by_year = by_year
+
+    def expression(self, model):
+        column = getattr(model, self.column)
+        if self.by_year:
+            return func.to_char(column, 'YYYY')
+        return column
+
+    def criterion(self, model, values):
+        """SQL condition matching rows with any of values; array overlap (&&) can use a GIN index"""
+        if self.is_array:
+            return self.expression(model).op('&&')(array(values, type_=db.String))
+        return self.expression(model).in_(values)
+
+    def row_values(self, row):
+        """This facet's values for a loaded row"""
+        value = getattr(row, self.column)
+        if value is None:
+            return ()
+        if self.is_array:
+            return value
+        if self.by_year:
+            return (f"{value.year:04d}",)
+        return (value,)
+
+
+PROJECT_FACETS = (
+    Facet('technology', 'technologies', is_array=True),
+    Facet('category', 'category'),
+    Facet('year', 'year'),
+)
+
+ARTICLE_FACETS = (
+    Facet('tag', 'tags', is_array=True),
+    Facet('year', 'starts_on', by_year=True),
+)
+
+
+def parse_facet_filters(facets):
+    """Read ?<facet>=a,b filters from the query string as {facet: sorted tuple of values}"""
+    selected = {}
+    for facet in facets:
+        values = {value.strip() for raw in request.args.getlist(facet.name) for value in raw.split(',') if value.strip()}
+        if values:
+            selected[facet.name] = tuple(sorted(values))
+    return selected
+
+
+def known_facet_values(section, model, facets):
+    """Every value each facet takes in the section, cached until the section changes"""
+    def build():
+        return {
+            name: frozenset(entry["value"] for entry in entries)
+            for name, entries in facet_counts(model, facets, {}).items()
+        }
+    return get_snapshot(f"{section}:facet-values", (section,), build)
+
+
+def narrow_to_known(selected, known):
+    """Drop filter values no row has; being alternatives, they can't change the result.
+
+    Returns (selected, unmatched). A facet whose values are all unknown
+    matches nothing whichever they are, so it keeps just its first value
+    and is named in unmatched for cache keys to use instead of the values.
+    """
+    narrowed, unmatched = {}, []
+    for name, values in selected.items():
+        present = tuple(value for value in values if value in known[name])
+        if present:
+            narrowed[name] = present
+        else:
+            narrowed[name] = values[:1]
+            unmatched.append(name)
+    return narrowed, tuple(unmatched)
+
+
+def _matches(row, facets, selected, skip=None):
+    for facet in facets:
+        values = selected.get(facet.name)
+        if values and facet.name != skip and not set(facet.row_values(row)).intersection(values):
+            return False
+    return True
+
+
+def _criteria(model, facets, selected, skip=None):
+    return [
+        facet.criterion(model, selected[facet.name])
+        for facet in facets
+        if selected.get(facet.name) and facet.name != skip
+    ]
+
+
+def load_filtered(model, columns, facets, selected, criteria=(), order_by=None):
+    """Read the given columns of the rows matching criteria and every selected facet, as records.
+
+    Values within one facet are alternatives: ?technology=Go,Rust returns
+    rows using either.
+    """
+    if not selected:
+        return read_rows(model, columns, *criteria, order_by=order_by)
+    if db.engine.dialect.name == 'postgresql':
+        return read_rows(model, columns, *criteria, *_criteria(model, facets, selected), order_by=order_by)
+
+    # Without array operators, filter in Python; the extra facet columns are never dumped
+    extra = tuple(facet.column for facet in facets if facet.column not in columns)
+    rows = read_rows(model, tuple(columns) + extra, *criteria, order_by=order_by)
+    return [row for row in rows if _matches(row, facets, selected)]
+
+
+def facet_counts(model, facets, selected, criteria=()):
+    """Count the rows per value of every facet, as {facet: [{"value", "count"}, ...]}.
+
+    Each facet is counted under criteria and the other facets' filters but
+    not its own, so a filter UI can show how many rows every alternative
+    would add. On PostgreSQL all facets come from a single aggregate query.
+    """
+    counts = {facet.name: Counter() for facet in facets}
+
+    if db.engine.dialect.name == 'postgresql':
+        branches = []
+        for facet in facets:
+            value = func.unnest(facet.expression(model)) if facet.is_array else facet.expression(model)
+            values = select(value.label('value')).where(*criteria, *_criteria(model, facets, selected, skip=facet.name)).subquery()
+            branches.append(
+                select(literal(facet.name).label('facet'), values.c.value, func.count().label('count'))
+                .where(values.c.value.is_not(None))
+                .group_by(values.c.value)
+            )
+        for name, value, count in db.session.execute(union_all(*branches)):
+            counts[name][value] = count
+    else:
+        rows = read_rows(model, tuple(dict.fromkeys(facet.column for facet in facets)), *criteria)
+        for facet in facets:
+            for row in rows:
+                if _matches(row, facets, selected, skip=facet.name):
+                    counts[facet.name].update(set(facet.row_values(row)))
+
+    return {
+        name: [{"value": value, "count": count} for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))]
+        for name, counter in counts.items()
+    }
@@ -0,0 +1,39 @@
+from functools import lru_cache
+from urllib.parse import quote, urlencode
+from flask import request
+
+
+def parse_fieldset(param, allowed):
+    """Parse a comma-separated query parameter into a sorted tuple of names.
+
+    Returns None when the parameter is absent and raises ValueError when it
+    names anything outside `allowed`. Sorting keeps equivalent requests on
+    the same cache entry.
+    """
+    raw = request.args.get(param)
+    if raw is None:
+        return None
+
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown {param}: {', '.join(sorted(unknown))}")
+    return tuple(sorted(names))
+
+
+def fieldset_key(key, **params):
+    """Build a cache key for a resource narrowed by the given fieldsets.
+
+    Values are percent-encoded, so a value containing & or = can't pose as
+    another parameter and share its cache entry.
+    """
+    parts = [(name, ','.join(values)) for name, values in sorted(params.items()) if values is not None]
+    if not parts:
+        return key
+    return f"{key}?{urlencode(parts, safe=',', quote_via=quote)}"
+
+
+@lru_cache(maxsize=256)
+def sparse_schema(schema_class, only, many=False):
+    """Return a (shared) schema instance that dumps only the given fields"""
+    return schema_class(only=only, many=many)
@@ -0,0 +1,115 @@
+import hashlib
+import mimetypes
+import os
+import stat
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from flask import Response, request, send_file
+
+
+# How uploaded files reach the client:
+#   python      - the worker streams the bytes itself (default)
+#   x-accel     - nginx streams them from an internal location (X-Accel-Redirect)
+#   x-sendfile  - Apache mod_xsendfile / lighttpd stream them (X-Sendfile)
+FILE_SERVING_MODE = os.environ.get('FILE_SERVING_MODE', 'python').lower()
+# Internal nginx location the upload root is exposed under in x-accel mode
+FILE_ACCEL_PREFIX = os.environ.get('FILE_ACCEL_PREFIX', '/protected-uploads/')
+UPLOAD_ROOT = os.path.abspath(os.environ.get('UPLOAD_ROOT', 'uploads'))
+FILE_METADATA_CACHE_SIZE = int(os.environ.get('FILE_METADATA_CACHE_SIZE', 512))
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_metadata = OrderedDict()
+_metadata_lock = threading.Lock()
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_file_metadata(path):
+    """Return (size, mtime, etag) for a file, or None if it does not exist.
+
+    The content hash is only recomputed when the file's size or mtime
+    changes, so a download normally costs a single stat() call.
+    """
+    path = os.path.abspath(path)
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(info.st_mode):
+        return None
+
+    signature = (info.st_mtime_ns, info.st_size)
+    cached = _metadata.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    mtime = datetime.fromtimestamp(info.st_mtime, tz=timezone.utc)
+    metadata = (info.st_size, mtime, hash_file(path)[:32])
+    with _metadata_lock:
+        _metadata[path] = (signature, metadata)
+        _metadata.move_to_end(path)
+        while len(_metadata) > FILE_METADATA_CACHE_SIZE:
+            _metadata.popitem(last=False)
+    return metadata
+
+
+def upload_relative_path(path):
+    """Return a path below the upload root as a '/'-separated relative path"""
+    return os.path.relpath(os.path.abspath(path), UPLOAD_ROOT).replace(os.sep, '/')
+
+
+def _offloaded_response(path, download_name, size, mtime, etag, as_attachment):
+    """Build an empty response telling the fronting proxy which file to stream"""
+    response = Response(status=200, mimetype=mimetypes.guess_type(download_name)[0] or 'application/octet-stream')
+    disposition = 'attachment' if as_attachment else 'inline'
+    response.headers['Content-Disposition'] = f'{disposition}; filename="{download_name}"'
+    response.set_etag(etag)
+    response.last_modified = mtime
+
+    if FILE_SERVING_MODE == 'x-accel':
+        response.headers['X-Accel-Redirect'] = FILE_ACCEL_PREFIX.rstrip('/') + '/' + upload_relative_path(path)
+    else:
+        response.headers['X-Sendfile'] = path
+
+    # The proxy handles Range itself; answer conditional requests here so it never has to open the file
+    return response.make_conditional(request.environ)
+
+
+def serve_file(path, download_name=None, as_attachment=True, immutable=False):
+    """Send a file as a download with ETag, Last-Modified and Range support.
+
+    Pass immutable=True for content-addressed files, which never change
+    under the same URL and may be cached by clients indefinitely. Returns
+    None if the file does not exist.
+    """
+    path = os.path.abspath(path)
+    metadata = get_file_metadata(path)
+    if metadata is None:
+        return None
+
+    size, mtime, etag = metadata
+    download_name = download_name or os.path.basename(path)
+    if FILE_SERVING_MODE in ('x-accel', 'x-sendfile'):
+        response = _offloaded_response(path, download_name, size, mtime, etag, as_attachment)
+    else:
+        response = send_file(
+            path, as_attachment=as_attachment, download_name=download_name,
+            etag=etag, last_modified=mtime, conditional=True, max_age=0
+        )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable' if immutable else 'no-cache'
+    return response
+
+
+def clear_file_metadata():
+    """Forget every cached file hash held by this worker"""
+    with _metadata_lock:
+        _metadata.clear()
@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+import os
+from datetime import timezone
+from flask import request, Response
+from werkzeug.http import http_date, quote_etag
+from app.utils.cache import get_generation, get_last_modified, get_snapshot
+from app.utils.json_provider import dumps
+
+
+# Bump this whenever the shape of a cached response changes so clients
+# holding an old representation don't get a 304 for it after a deploy
+REPRESENTATION_VERSION = 1
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = int(os.environ.get('GZIP_MIN_SIZE', '512'))
+GZIP_ETAG_SUFFIX = '-gzip'
+
+
+def compute_etag(key, generation):
+    """Build a strong ETag for a resource from the versions of the sections it depends on"""
+    raw = f"{REPRESENTATION_VERSION}:{key}:{'.'.join(str(version) for version in generation)}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def render_json(data):
+    """Encode data once as compact UTF-8 JSON, plus a gzip variant when it is large enough"""
+    body = dumps(data)
+    gzipped = None
+    if len(body) >= GZIP_MIN_SIZE:
+        # mtime=0 keeps the compressed bytes identical across workers
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    return body, gzipped
+
+
+def matching_etag(etag):
+    """Return the variant of etag the client already holds, if any"""
+    if not request.if_none_match:
+        return None
+    for candidate in (etag, etag + GZIP_ETAG_SUFFIX):
+        if request.if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def conditional_get(key, sections, builder):
+    """Serve builder()'s result as pre-encoded JSON with ETag/Last-Modified headers.
+
+    The body is rendered to bytes (and gzip) once per content generation and
+    reused until one of the sections changes. A matching conditional request
+    gets a 304 after the (cached) version check, without touching the snapshot.
+    """
+    generation = get_generation(sections)
+    if generation is None:
+        # Version table unavailable, serve the response without validators
+        return builder()
+
+    etag = compute_etag(key, generation)
+    last_modified = get_last_modified(sections)
+    if last_modified is not None:
+        # HTTP dates have second precision
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+
+    headers = {
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding'
+    }
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+
+    # If-None-Match takes precedence over If-Modified-Since
+    if request.if_none_match:
+        matched = matching_etag(etag)
+        if matched:
+            headers['ETag'] = quote_etag(matched)
+            return Response(status=304, headers=headers)
+    elif last_modified is not None and request.if_modified_since is not None:
+        if last_modified <= request.if_modified_since:
+            headers['ETag'] = quote_etag(etag)
+            return Response(status=304, headers=headers)
+
+    body, gzipped = get_snapshot(key, sections, lambda: render_json(builder()), generation=generation)
+    if gzipped is not None and 'gzip' in request.accept_encodings:
+        body = gzipped
+        headers['Content-Encoding'] = 'gzip'
+        etag += GZIP_ETAG_SUFFIX
+    headers['ETag'] = quote_etag(etag)
+
+    return Response(body, status=200, headers=headers, content_type='application/json')
@@ -0,0 +1,145 @@
+import os
+import re
+from datetime import datetime
+from app.models import db, ImageAsset, Project, Testimonial
+from app.utils.cache import mark_changed
+from app.utils.storage import IMAGE_URL_PREFIX, blob_path, is_blob_name, journal_blob
+
+
+# Widths (in pixels) of the WebP copies made of every uploaded image
+IMAGE_WIDTHS = tuple(int(width) for width in os.environ.get('IMAGE_WIDTHS', '320,640,1280').split(','))
+IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', 80))
+IMAGE_MAX_ATTEMPTS = int(os.environ.get('IMAGE_MAX_ATTEMPTS', 3))
+
+DERIVATIVE_PATTERN = re.compile(r'^([0-9a-f]{64})_(\d+)w\.webp$')
+
+
+def image_url(name):
+    """Return the public URL of an uploaded image or one of its derivatives"""
+    return IMAGE_URL_PREFIX + name
+
+
+def image_name(url):
+    """Return the stored name behind an image URL, or None if it is not an upload"""
+    if url and url.startswith(IMAGE_URL_PREFIX):
+        return url[len(IMAGE_URL_PREFIX):]
+    return None
+
+
+def release_image(url):
+    """Let go of the uploaded image behind a URL that is being removed or replaced
+
+    Other records may show the same image; the GC removes it once none does.
+    """
+    name = image_name(url)
+    if is_blob_name(name):
+        journal_blob(name)
+
+
+def derivative_name(original, width):
+    return f"{original.split('.')[0]}_{width}w.webp"
+
+
+def image_file_path(name):
+    """Return where an original or derivative image is stored, or None for an invalid name"""
+    if is_blob_name(name):
+        return blob_path(name)
+    match = DERIVATIVE_PATTERN.match(name or '')
+    if match:
+        # Derivatives sit next to their original in the blob store
+        return os.path.join(os.path.dirname(blob_path(match.group(1))), name)
+    return None
+
+
+def register_image(stored_name):
+    """Return the ImageAsset of a stored image, queueing it for resizing if it is new"""
+    asset = ImageAsset.query.filter_by(original=stored_name).first()
+    if asset is None:
+        asset = ImageAsset(original=stored_name, status='pending')
+        db.session.add(asset)
+    return asset
+
+
+def srcset_for(url):
+    """Return the {width: url} map of an uploaded image, or None if it has none (yet)"""
+    name = image_name(url)
+    if not name:
+        return None
+    asset = ImageAsset.query.filter_by(original=name, status='ready').first()
+    return asset.derivatives if asset else None
+
+
+def generate_derivatives(original):
+    """Write WebP copies of a stored image at each configured width.
+
+    Images are never scaled up; one narrower than every configured width
+    gets a single copy at its own size. Returns ((width, height), {width: url}).
+    """
+    # Only the image worker needs Pillow
+    from PIL import Image, ImageOps
+
+    derivatives = {}
+    with Image.open(blob_path(original)) as image:
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+        widths = [target for target in IMAGE_WIDTHS if target < width] or [width]
+        for target in widths:
+            resized = image.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+            name = derivative_name(original, target)
+            path = image_file_path(name)
+            temp_path = path + '.tmp'
+            resized.save(temp_path, 'WEBP', quality=IMAGE_QUALITY, method=6)
+            os.replace(temp_path, path)
+            derivatives[str(target)] = image_url(name)
+
+    return (width, height), derivatives
+
+
+def apply_srcset(asset):
+    """Copy a finished image's derivatives onto the projects and testimonials that show it"""
+    url = image_url(asset.original)
+    sections = []
+    if Project.query.filter(Project.image == url).update({Project.image_srcset: asset.derivatives}, synchronize_session=False):
+        sections.append('projects')
+    if Testimonial.query.filter(Testimonial.avatar == url).update({Testimonial.avatar_srcset: asset.derivatives}, synchronize_session=False):
+        sections.append('testimonials')
+    if sections:
+        mark_changed(*sections)
+
+
+def process_pending_images(batch_size=5):
+    """Generate derivatives for one batch of new images and return how many were processed
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    workers can run in parallel without resizing the same image twice.
+    """
+    batch = (
+        ImageAsset.query
+        .filter(ImageAsset.status == 'pending')
+        .order_by(ImageAsset.created_at, ImageAsset.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for asset in batch:
+        asset.attempts += 1
+        try:
+            (asset.width, asset.height), asset.derivatives = generate_derivatives(asset.original)
+        except Exception as e:
+            asset.last_error = str(e)
+            if asset.attempts >= IMAGE_MAX_ATTEMPTS:
+                asset.status = 'failed'
+                print(f"Giving up on image {asset.original}: {str(e)}")
+        else:
+            asset.status = 'ready'
+            asset.processed_at = datetime.utcnow()
+            asset.last_error = None
+            apply_srcset(asset)
+
+    # Releases the row locks
+    db.session.commit()
+    return len(batch)
@@ -0,0 +1,82 @@
+import json
+import os
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask import current_app, make_response
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # the stdlib encoder is used instead
+    orjson = None
+
+
+# auto uses orjson when it is installed; stdlib forces the json module
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto').lower()
+
+
+def default(obj):
+    """Encode the values either JSON library can't handle on its own"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj, indent=False):
+    if indent:
+        return json.dumps(obj, default=default, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+if orjson is not None and JSON_BACKEND != 'stdlib':
+    JSON_LIBRARY = 'orjson'
+
+    # Non-string keys (e.g. image widths) are turned into strings, as the json module does
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj, indent=False):
+        """Encode obj as compact UTF-8 JSON bytes (indented when asked)"""
+        options = ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else ORJSON_OPTIONS
+        try:
+            return orjson.dumps(obj, default=default, option=options)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which orjson refuses and json accepts
+            return _stdlib_dumps(obj, indent)
+
+    loads = orjson.loads
+else:
+    JSON_LIBRARY = 'json'
+    dumps = _stdlib_dumps
+    loads = json.loads
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps()/loads() above.
+
+    Used by jsonify(), request.get_json() and, through output_json(), every
+    Flask-RESTful resource, so the whole API encodes JSON the same way.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, indent=self._app.debug), mimetype='application/json')
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTful representation for application/json"""
+    response = make_response(dumps(data, indent=current_app.debug), code)
+    response.headers.extend(headers or {})
+    return response
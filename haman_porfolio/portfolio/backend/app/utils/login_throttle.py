@@ -0,0 +1,260 @@
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import bindparam, update
+from app.models import AdminUser, db
+from app.utils.rate_limit import RATE_LIMIT_MAX_KEYS, RATE_LIMIT_STORAGE_URL
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+
+# Failed attempts allowed per account / per client IP before locking them out
+LOGIN_MAX_ACCOUNT_FAILURES = int(os.environ.get('LOGIN_MAX_ACCOUNT_FAILURES', 5))
+LOGIN_MAX_IP_FAILURES = int(os.environ.get('LOGIN_MAX_IP_FAILURES', 20))
+# Failures older than this (seconds) are forgotten
+LOGIN_FAILURE_WINDOW = float(os.environ.get('LOGIN_FAILURE_WINDOW', 900))
+# The lockout doubles with every failure past the budget, up to the maximum
+LOGIN_LOCKOUT_BASE = float(os.environ.get('LOGIN_LOCKOUT_BASE', 30))
+LOGIN_LOCKOUT_MAX = float(os.environ.get('LOGIN_LOCKOUT_MAX', 3600))
+
+# Password hash checks allowed to run at once across all workers on this host
+LOGIN_HASH_CONCURRENCY = int(os.environ.get('LOGIN_HASH_CONCURRENCY', 2))
+LOGIN_HASH_WAIT = float(os.environ.get('LOGIN_HASH_WAIT', 0.5))
+LOGIN_HASH_LOCK_DIR = os.environ.get('LOGIN_HASH_LOCK_DIR', tempfile.gettempdir())
+
+# Successful logins are written to AdminUser.last_login in batches
+LAST_LOGIN_FLUSH_INTERVAL = float(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL', 30))
+
+
+def lockout_seconds(failures, budget):
+    """Return how long to lock out a key after the given number of failures"""
+    if failures < budget:
+        return 0
+    return min(LOGIN_LOCKOUT_BASE * 2 ** (failures - budget), LOGIN_LOCKOUT_MAX)
+
+
+class MemoryFailureStore:
+    """Per-process failure counters; the least recently seen keys are evicted first"""
+
+    def __init__(self, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def locked_for(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        return max(entry[2] - time.time(), 0)
+
+    def fail(self, key, budget):
+        now = time.time()
+        with self._lock:
+            failures, first_failure_at, _ = self._entries.pop(key, (0, now, 0))
+            if now - first_failure_at > LOGIN_FAILURE_WINDOW:
+                failures, first_failure_at = 0, now
+            failures += 1
+            locked_until = now + lockout_seconds(failures, budget)
+            self._entries[key] = (failures, first_failure_at, locked_until)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisFailureStore:
+    """Failure counters shared by every worker through Redis (requires the redis package)"""
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def locked_for(self, key):
+        remaining = self.client.pttl(f"login_lock:{key}")
+        return max(remaining, 0) / 1000.0
+
+    def fail(self, key, budget):
+        counter_key = f"login_failures:{key}"
+        failures = self.client.incr(counter_key)
+        if failures == 1:
+            self.client.expire(counter_key, int(LOGIN_FAILURE_WINDOW))
+        lockout = lockout_seconds(failures, budget)
+        if lockout:
+            self.client.set(f"login_lock:{key}", 1, px=int(lockout * 1000))
+
+    def reset(self, key):
+        self.client.delete(f"login_failures:{key}", f"login_lock:{key}")
+
+
+def create_failure_store():
+    """Build the configured failure store (shares RATE_LIMIT_STORAGE_URL)"""
+    if RATE_LIMIT_STORAGE_URL.startswith('redis'):
+        return RedisFailureStore(RATE_LIMIT_STORAGE_URL)
+    return MemoryFailureStore()
+
+
+failures = create_failure_store()
+
+
+def _keys(email, ip):
+    return f"account:{(email or '').strip().lower()}", f"ip:{ip}"
+
+
+def login_locked_for(email, ip):
+    """Return the seconds until this account and client may try to log in again (0 if allowed)"""
+    account_key, ip_key = _keys(email, ip)
+    return max(failures.locked_for(account_key), failures.locked_for(ip_key))
+
+
+def record_login_failure(email, ip):
+    """Count a failed login against both the account and the client IP"""
+    account_key, ip_key = _keys(email, ip)
+    failures.fail(account_key, LOGIN_MAX_ACCOUNT_FAILURES)
+    failures.fail(ip_key, LOGIN_MAX_IP_FAILURES)
+
+
+def record_login_success(email):
+    """Clear the failure count of an account after a successful login"""
+    account_key, _ = _keys(email, None)
+    failures.reset(account_key)
+
+
+class HashSlots:
+    """A host-wide semaphore built from flock()ed slot files.
+
+    Gunicorn's sync workers are separate processes, so a threading semaphore
+    would not limit anything; each slot is an exclusive lock on its own file
+    instead. Falls back to a per-process semaphore where fcntl is unavailable.
+    """
+
+    def __init__(self, size, lock_dir):
+        self.size = max(size, 1)
+        self.lock_dir = lock_dir
+        self._semaphore = threading.BoundedSemaphore(self.size)
+        self._files = {}
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._pid = None
+
+    def _slot_files(self):
+        # Lock files are opened per process so a fork never shares a lock
+        if self._pid != os.getpid():
+            self._files = {}
+            self._held = set()
+            self._pid = os.getpid()
+        return self._files
+
+    def _try_acquire(self):
+        with self._held_lock:
+            files = self._slot_files()
+            for slot in range(self.size):
+                # flock() would let a second thread "lock" a file this process already holds
+                if slot in self._held:
+                    continue
+                handle = files.get(slot)
+                if handle is None:
+                    path = os.path.join(self.lock_dir, f"portfolio-login-slot-{slot}.lock")
+                    handle = files[slot] = open(path, 'a')
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                self._held.add(slot)
+                return slot
+        return None
+
+    def _release(self, slot):
+        with self._held_lock:
+            fcntl.flock(self._files[slot], fcntl.LOCK_UN)
+            self._held.discard(slot)
+
+    @contextmanager
+    def acquire(self, timeout):
+        """Yield True while holding a slot, or False if none freed up within the timeout"""
+        if not self._semaphore.acquire(timeout=timeout):
+            yield False
+            return
+
+        slot = None
+        try:
+            if fcntl is not None:
+                deadline = time.monotonic() + timeout
+                slot = self._try_acquire()
+                while slot is None and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                    slot = self._try_acquire()
+                if slot is None:
+                    yield False
+                    return
+            yield True
+        finally:
+            if slot is not None:
+                self._release(slot)
+            self._semaphore.release()
+
+
+hash_slots = HashSlots(LOGIN_HASH_CONCURRENCY, LOGIN_HASH_LOCK_DIR)
+
+
+class LastLoginRecorder:
+    """Collects successful logins and writes them to AdminUser.last_login in one batch"""
+
+    def __init__(self, interval=LAST_LOGIN_FLUSH_INTERVAL):
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def record(self, admin_id, logged_in_at):
+        app = current_app._get_current_object()
+        with self._lock:
+            self._pending[admin_id] = logged_in_at
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush_in_background, args=(app,))
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_in_background(self, app):
+        with self._lock:
+            self._timer = None
+        with app.app_context():
+            try:
+                self.flush()
+            finally:
+                db.session.remove()
+
+    def flush(self):
+        """Write every pending last_login timestamp with a single UPDATE statement"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        table = AdminUser.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('admin_id'))
+            .values(last_login=bindparam('logged_in_at'))
+        )
+        try:
+            db.session.execute(
+                statement,
+                [{'admin_id': admin_id, 'logged_in_at': at} for admin_id, at in pending.items()]
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error updating last login times: {str(e)}")
+
+
+last_logins = LastLoginRecorder()
@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import func, text, tuple_
+from app.models import db
+
+
+def encode_cursor(created_at, row_id):
+    """Encode the (created_at, id) position of a row as an opaque cursor"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query, created_column, id_column, limit, cursor=None):
+    """Return one page of rows ordered newest first, plus the cursor for the next page.
+
+    Rows are located by seeking past the last (created_at, id) seen, so the
+    cost of a page does not depend on how deep into the table it is.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_column, id_column) < tuple_(created_at, row_id))
+
+    rows = query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def approximate_count(model):
+    """Return an approximate row count without scanning the table where the backend allows it"""
+    if db.engine.dialect.name == 'postgresql':
+        estimate = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {'table': model.__tablename__}
+        ).scalar()
+        # reltuples is -1 (or 0) until the table has been vacuumed or analyzed
+        if estimate is not None and estimate > 0:
+            return int(estimate)
+    return db.session.query(func.count(model.id)).scalar()
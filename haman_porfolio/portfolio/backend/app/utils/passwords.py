@@ -0,0 +1,87 @@
+import hashlib
+import os
+import threading
+import time
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+# Hashes are written as "pbkdf2:<digest>:<iterations>$salt$hash" (werkzeug's format),
+# so every stored hash records the parameters it was made with.
+PASSWORD_HASH_DIGEST = os.environ.get('PASSWORD_HASH_DIGEST', 'sha256')
+# Pin the iteration count; when unset it is calibrated against this host at startup
+PASSWORD_HASH_ITERATIONS = os.environ.get('PASSWORD_HASH_ITERATIONS')
+# Time one verification should take on this host when calibrating
+PASSWORD_HASH_TARGET_MS = float(os.environ.get('PASSWORD_HASH_TARGET_MS', 250))
+# Never go below this, however slow the host (OWASP guidance for PBKDF2-SHA256)
+PASSWORD_HASH_MIN_ITERATIONS = int(os.environ.get('PASSWORD_HASH_MIN_ITERATIONS', 600000))
+# Stored hashes at least this fraction below the policy are upgraded; smaller gaps are
+# left alone, so small differences between workers' calibrations do not rehash on
+# every login. Hashes above the policy are never weakened.
+PASSWORD_REHASH_TOLERANCE = float(os.environ.get('PASSWORD_REHASH_TOLERANCE', 0.25))
+
+CALIBRATION_ITERATIONS = 20000
+CALIBRATION_ROUNDS = 3
+ITERATION_STEP = 50000
+
+_iterations = None
+_iterations_lock = threading.Lock()
+
+
+def calibrate_iterations(target_ms=PASSWORD_HASH_TARGET_MS):
+    """Benchmark PBKDF2 on this host and return the iterations that take about target_ms.
+
+    The result is rounded down to a multiple of ITERATION_STEP so hosts of
+    similar speed settle on the same value.
+    """
+    best = None
+    for _ in range(CALIBRATION_ROUNDS):
+        started = time.perf_counter()
+        hashlib.pbkdf2_hmac(PASSWORD_HASH_DIGEST, b'calibration', b'calibration-salt', CALIBRATION_ITERATIONS)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    iterations = int(CALIBRATION_ITERATIONS * (target_ms / 1000.0) / best)
+    iterations = iterations // ITERATION_STEP * ITERATION_STEP
+    return max(iterations, PASSWORD_HASH_MIN_ITERATIONS)
+
+
+def get_iterations():
+    """Return the PBKDF2 iteration count of the current policy"""
+    global _iterations
+    if _iterations is None:
+        with _iterations_lock:
+            if _iterations is None:
+                if PASSWORD_HASH_ITERATIONS:
+                    _iterations = int(PASSWORD_HASH_ITERATIONS)
+                else:
+                    _iterations = calibrate_iterations()
+    return _iterations
+
+
+def get_method():
+    """Return the werkzeug method string of the current policy"""
+    return f"pbkdf2:{PASSWORD_HASH_DIGEST}:{get_iterations()}"
+
+
+def hash_password(password):
+    """Hash a password with the current policy"""
+    return generate_password_hash(password, method=get_method())
+
+
+def verify_password(password_hash, password):
+    """Check a password against a stored hash, whatever parameters it was made with"""
+    return check_password_hash(password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Return True if a stored hash was made with a different algorithm, or a lower cost, than the policy"""
+    method = password_hash.split('$', 1)[0]
+    parts = method.split(':')
+    if len(parts) != 3 or parts[0] != 'pbkdf2' or parts[1] != PASSWORD_HASH_DIGEST:
+        return True
+
+    try:
+        iterations = int(parts[2])
+    except ValueError:
+        return True
+    return iterations < get_iterations() * (1 - PASSWORD_REHASH_TOLERANCE)
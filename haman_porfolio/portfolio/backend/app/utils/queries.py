@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from sqlalchemy import func, literal, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.models import db, Portfolio, PortfolioSchema
+from app.utils.read_models import read_rows, record_class
+
+
+# Nested collections of the portfolio document, as declared on PortfolioSchema
+PORTFOLIO_COLLECTIONS = ('skills', 'education', 'experience', 'certifications', 'testimonials', 'articles', 'projects')
+PORTFOLIO_COLUMNS = ('id', 'name', 'title', 'summary', 'about', 'contact', 'created_at', 'updated_at')
+
+
+def _collection_model(name):
+    """Return the model of a nested collection and the columns its schema dumps"""
+    model = getattr(Portfolio, name).property.mapper.class_
+    return model, tuple(PortfolioSchema._declared_fields[name].nested._declared_fields)
+
+
+def _collection_subquery(name):
+    """Build a correlated subquery aggregating one collection into a JSON array"""
+    model, fields = _collection_model(name)
+
+    pairs = []
+    for field_name in fields:
+        pairs.extend([literal(field_name), getattr(model, field_name)])
+    row = func.json_build_object(*pairs)
+
+    return (
+        select(func.coalesce(func.json_agg(aggregate_order_by(row, model.id)), text("'[]'::json")))
+        .where(model.portfolio_id == Portfolio.id)
+        .scalar_subquery()
+        .label(name)
+    )
+
+
+def _load_portfolio_aggregated(columns, collections):
+    """Fetch the portfolio and its collections in a single round trip (PostgreSQL only)"""
+    selected = [getattr(Portfolio, name) for name in columns]
+    subqueries = [_collection_subquery(name) for name in collections]
+    row = db.session.execute(select(*selected, *subqueries).order_by(Portfolio.id).limit(1)).first()
+    if row is None:
+        return None
+    return dict(row._mapping)
+
+
+def _load_portfolio_records(columns, collections):
+    """Fetch the portfolio and then one SELECT per collection, as records"""
+    row = db.session.execute(
+        select(Portfolio.id, *[getattr(Portfolio, name) for name in columns]).order_by(Portfolio.id).limit(1)
+    ).first()
+    if row is None:
+        return None
+
+    nested = []
+    for name in collections:
+        model, fields = _collection_model(name)
+        nested.append(read_rows(model, fields, model.portfolio_id == row[0]))
+    return record_class(Portfolio, tuple(columns) + tuple(collections))(*row[1:], *nested)
+
+
+def load_portfolio_graph(columns=PORTFOLIO_COLUMNS, collections=PORTFOLIO_COLLECTIONS):
+    """Load the portfolio and the requested nested collections in a fixed number of queries.
+
+    Only the given columns and collections are read from the database. On
+    PostgreSQL this is a single statement returning each collection as a JSON
+    array; other backends issue one SELECT per collection. The result can be
+    passed straight to portfolio_schema.dump().
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return _load_portfolio_aggregated(columns, collections)
+    return _load_portfolio_records(columns, collections)
+
+
+def load_section(model, fields):
+    """Read only the given columns of every row in a section, as records"""
+    return read_rows(model, fields)
+
+
+@contextmanager
+def read_snapshot():
+    """Run the enclosed reads against one consistent snapshot of the database.
+
+    On PostgreSQL this opens a fresh REPEATABLE READ transaction so every
+    statement inside sees the same committed state; other backends run the
+    reads as they are. The session's transaction is rolled back before and
+    after, so it must not hold any changes: use this only on read-only paths.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        yield
+        return
+
+    session = db.session()
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("read_snapshot() would discard the session's pending changes")
+    # End whatever transaction earlier reads (e.g. the version check) started
+    session.rollback()
+    db.session.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+    try:
+        yield
+    finally:
+        db.session.rollback()
@@ -0,0 +1,28 @@
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Count every statement executed while handling a request"""
+    if has_app_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def get_query_count():
+    """Return the number of statements executed so far in the current request"""
+    return g.get('query_count', 0)
+
+
+def init_query_stats(app):
+    """Count database round trips per request and report them in an X-Query-Count header"""
+    if not event.contains(Engine, 'before_cursor_execute', _count_query):
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+
+    if not app.config.get('QUERY_COUNT_HEADER'):
+        return
+
+    @app.after_request
+    def add_query_count_header(response):
+        response.headers['X-Query-Count'] = str(get_query_count())
+        return response
@@ -0,0 +1,152 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request
+
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+# e.g. redis://localhost:6379/0 to share budgets between workers; in-process otherwise
+RATE_LIMIT_STORAGE_URL = os.environ.get('RATE_LIMIT_STORAGE_URL', '')
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 10000))
+
+# Per-route budgets as "<requests>/<seconds>"
+RATE_LIMITS = {
+    'contact': os.environ.get('RATE_LIMIT_CONTACT', '5/600'),
+    'newsletter': os.environ.get('RATE_LIMIT_NEWSLETTER', '5/600'),
+    'testimonial': os.environ.get('RATE_LIMIT_TESTIMONIAL', '3/600'),
+    'search': os.environ.get('RATE_LIMIT_SEARCH', '60/60'),
+}
+
+
+def parse_limit(value):
+    """Parse a "<requests>/<seconds>" budget"""
+    count, window = value.split('/')
+    return int(count), float(window)
+
+
+def sliding_window(previous, current, elapsed, limit, window):
+    """Estimate the request rate over the last window from two fixed-window counters.
+
+    Returns (allowed, retry_after) for one more request, where retry_after is the
+    number of seconds until the estimate drops back under the limit.
+    """
+    weight = 1 - elapsed / window
+    if previous * weight + current + 1 <= limit:
+        return True, 0
+
+    if current + 1 > limit or previous == 0:
+        # Only the next window can make room
+        return False, window - elapsed
+    # Wait until enough of the previous window has slid out
+    needed = 1 - (limit - current - 1) / previous
+    return False, max(needed * window - elapsed, 0)
+
+
+class MemoryBackend:
+    """Per-process counters; the least recently seen keys are evicted first"""
+
+    def __init__(self, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        bucket = int(now // window)
+        elapsed = now - bucket * window
+
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < bucket - 1:
+                previous, current = 0, 0
+            elif entry[0] == bucket - 1:
+                previous, current = entry[2], 0
+            else:
+                previous, current = entry[1], entry[2]
+
+            allowed, retry_after = sliding_window(previous, current, elapsed, limit, window)
+            if allowed:
+                current += 1
+            self._counters[key] = (bucket, previous, current, now + 2 * window)
+            self._counters.move_to_end(key)
+            self._evict(now)
+
+        return allowed, retry_after
+
+    def _evict(self, now):
+        # Drop keys that have gone idle, then the oldest ones if still over size
+        while self._counters:
+            key, entry = next(iter(self._counters.items()))
+            if entry[3] > now and len(self._counters) <= self.max_keys:
+                break
+            self._counters.popitem(last=False)
+
+
+class RedisBackend:
+    """Counters shared by every worker through Redis (requires the redis package)"""
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        bucket = int(now // window)
+        elapsed = now - bucket * window
+        current_key = f"rate_limit:{key}:{bucket}"
+        previous_key = f"rate_limit:{key}:{bucket - 1}"
+
+        pipe = self.client.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, int(math.ceil(window * 2)))
+        pipe.get(previous_key)
+        current, _, previous = pipe.execute()
+
+        # The increment above already counted this request
+        allowed, retry_after = sliding_window(int(previous or 0), current - 1, elapsed, limit, window)
+        if not allowed:
+            self.client.decr(current_key)
+        return allowed, retry_after
+
+
+def create_backend():
+    """Build the configured counter backend"""
+    if RATE_LIMIT_STORAGE_URL.startswith('redis'):
+        return RedisBackend(RATE_LIMIT_STORAGE_URL)
+    return MemoryBackend()
+
+
+backend = create_backend()
+
+
+def get_client_ip():
+    """Return the address the request came from.
+
+    Behind reverse proxies, create_app() installs ProxyFix with the
+    configured TRUSTED_PROXY_COUNT, which sets remote_addr from the
+    X-Forwarded-For entry the nearest trusted proxy added. The leftmost
+    entries are whatever the client sent, so they are never used.
+    """
+    return request.remote_addr or 'unknown'
+
+
+def rate_limit(name):
+    """Decorator that rejects a client once it exceeds the named route budget"""
+    limit, window = parse_limit(RATE_LIMITS[name])
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if RATE_LIMIT_ENABLED:
+                allowed, retry_after = backend.hit(f"{name}:{get_client_ip()}", limit, window)
+                if not allowed:
+                    headers = {'Retry-After': str(max(1, int(math.ceil(retry_after))))}
+                    return {'message': 'Too many requests. Please try again later.'}, 429, headers
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
@@ -0,0 +1,41 @@
+from functools import lru_cache
+from sqlalchemy import select
+from app.models import db
+
+
+# Public read endpoints only serialize what they load, so they don't need ORM
+# instances: those carry instrumentation state, are tracked in the session's
+# identity map and pull every column. The functions here select just the
+# columns a response uses and hold each row in a small slotted record.
+
+
+@lru_cache(maxsize=256)
+def record_class(model, fields):
+    """Return a read-only row class for the given columns of model, with __slots__ and no __dict__"""
+    namespace = {}
+    exec(
+        f"def __init__(self, {', '.join(fields)}):\n"
+        + ''.join(f"    self.{name} = {name}\n" for name in fields),
+        namespace
+    )
+
+    def __repr__(self):
+        return f"<{model.__name__}Record {', '.join(f'{name}={getattr(self, name)!r}' for name in fields)}>"
+
+    return type(f"{model.__name__}Record", (), {
+        '__slots__': fields,
+        '__init__': namespace['__init__'],
+        '__repr__': __repr__
+    })
+
+
+def schema_columns(schema):
+    """Names of the model columns a schema dumps"""
+    return tuple(field.attribute or name for name, field in schema.dump_fields.items())
+
+
+def read_rows(model, fields, *criteria, order_by=None):
+    """Select the given columns of model as records, in id order unless order_by is given"""
+    record = record_class(model, tuple(fields))
+    statement = select(*[getattr(model, name) for name in fields]).where(*criteria).order_by(*(order_by or (model.id,)))
+    return [record(*row) for row in db.session.execute(statement)]
@@ -0,0 +1,240 @@
+import html
+import math
+import os
+import re
+import shlex
+from collections import defaultdict
+from sqlalchemy import desc, func, literal, select, union_all
+from app.models import db, SEARCH_CONFIG, SEARCH_DOCUMENTS, Article, Experience, Project, Service
+from app.utils.cache import get_snapshot
+from app.utils.read_models import read_rows
+
+
+SEARCH_DEFAULT_RESULTS = int(os.environ.get('SEARCH_DEFAULT_RESULTS', 20))
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 50))
+SEARCH_MAX_QUERY_LENGTH = 200
+# Roughly how many words of the description each result's snippet shows
+SNIPPET_WORDS = 25
+
+# Result type -> (model, content section); every result shows the row's title
+SEARCH_TYPES = {
+    'project': (Project, 'projects'),
+    'article': (Article, 'articles'),
+    'experience': (Experience, 'experience'),
+    'service': (Service, 'services'),
+}
+
+# Snippets are highlighted with these markers, then HTML-escaped and given <mark> tags
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+
+def highlight(snippet):
+    """Escape a snippet for HTML and turn its highlight markers into <mark> tags"""
+    return (
+        html.escape(snippet or '', quote=False)
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_STOP, '</mark>')
+    )
+
+
+def _result(row):
+    result_type, row_id, title, snippet, rank = row
+    return {
+        "type": result_type,
+        "id": row_id,
+        "title": title,
+        "snippet": highlight(snippet),
+        "rank": round(float(rank), 4)
+    }
+
+
+def search_postgres(q, types, limit):
+    """Rank rows against q with their search_vector column, in one query.
+
+    Each type contributes at most `limit` rows; PostgreSQL only builds the
+    (expensive) ts_headline snippets for the rows that survive that limit.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords={SNIPPET_WORDS}, MinWords=10"
+
+    branches = []
+    for name in types:
+        model, section = SEARCH_TYPES[name]
+        rank = func.ts_rank_cd(model.search_vector, query)
+        branches.append(
+            select(
+                literal(name).label('type'),
+                model.id.label('id'),
+                model.title.label('title'),
+                func.ts_headline(SEARCH_CONFIG, func.coalesce(model.description, ''), query, options).label('snippet'),
+                rank.label('rank')
+            )
+            .where(model.search_vector.op('@@')(query))
+            .order_by(rank.desc(), model.id)
+            .limit(limit)
+        )
+
+    statement = union_all(*branches).order_by(desc('rank'), 'type', 'id').limit(limit)
+    return [_result(row) for row in db.session.execute(statement)]
+
+
+# Fallback for databases without full-text search (e.g. SQLite in development):
+# an inverted index over the same columns, built in Python and cached until
+# one of the searched sections changes.
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# PostgreSQL's rank weights for A and B
+WEIGHTS = {'A': 1.0, 'B': 0.4}
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out
+over own same she should so some such than that the their theirs them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with you your yours
+""".split())
+
+
+def stem(word):
+    """Reduce a lowercase word to a crude English stem, so "deploying" matches "deployed"
+
+    Much simpler than PostgreSQL's Snowball stemmer, but applied the same way
+    to documents and queries.
+    """
+    if len(word) > 4 and word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif word.endswith(('sses', 'xes', 'ches', 'shes')):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 4 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def terms(text):
+    """Stemmed, stop-word free terms of a text"""
+    return [stem(word) for word in TOKEN_PATTERN.findall((text or '').lower()) if word not in STOP_WORDS]
+
+
+def parse_query(q):
+    """Split a web-style query into (required, excluded) terms.
+
+    Words and "quoted phrases" are all required; -word excludes rows
+    containing word.
+    """
+    try:
+        words = shlex.split(q)
+    except ValueError:  # unbalanced quotes
+        words = q.split()
+
+    required, excluded = [], []
+    for word in words:
+        if word.startswith('-') and len(word) > 1:
+            excluded.extend(terms(word[1:]))
+        else:
+            required.extend(terms(word))
+    return required, excluded
+
+
+class SearchIndex:
+    """Inverted index from terms to the weighted count of each document containing them"""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = []
+
+    def add(self, result_type, row_id, title, description, weighted_texts):
+        document = len(self.documents)
+        self.documents.append((result_type, row_id, title, description))
+        for text, weight in weighted_texts:
+            for term in terms(text):
+                postings = self.postings[term]
+                postings[document] = postings.get(document, 0) + WEIGHTS[weight]
+
+    def search(self, q, types, limit):
+        required, excluded = parse_query(q)
+        if not required:
+            return []
+
+        matches = None
+        for term in required:
+            documents = self.postings.get(term, {}).keys()
+            matches = set(documents) if matches is None else matches.intersection(documents)
+        for term in excluded:
+            matches.difference_update(self.postings.get(term, {}).keys())
+
+        total = len(self.documents)
+        scored = []
+        for document in matches:
+            if self.documents[document][0] not in types:
+                continue
+            score = 0.0
+            for term in set(required):
+                postings = self.postings[term]
+                score += postings[document] * math.log(1 + total / len(postings))
+            scored.append((-score, self.documents[document][0], self.documents[document][1], document))
+        scored.sort()
+
+        results = []
+        for score, result_type, row_id, document in scored[:limit]:
+            title, description = self.documents[document][2:]
+            snippet = make_snippet(description, set(required))
+            results.append(_result((result_type, row_id, title, snippet, -score)))
+        return results
+
+
+def make_snippet(text, required):
+    """Cut about SNIPPET_WORDS words of text around the first matching term, marking every match"""
+    words = list(TOKEN_PATTERN.finditer(text or ''))
+    if not words:
+        return ''
+
+    first = next((index for index, word in enumerate(words) if stem(word.group().lower()) in required), 0)
+    start = max(0, min(first - SNIPPET_WORDS // 4, len(words) - SNIPPET_WORDS))
+    window = words[start:start + SNIPPET_WORDS]
+
+    pieces = []
+    position = window[0].start()
+    for word in window:
+        pieces.append(text[position:word.start()])
+        if stem(word.group().lower()) in required:
+            pieces.append(HIGHLIGHT_START + word.group() + HIGHLIGHT_STOP)
+        else:
+            pieces.append(word.group())
+        position = word.end()
+    return ''.join(pieces)
+
+
+def build_search_index():
+    """Index every searchable row, reading only the columns search needs"""
+    index = SearchIndex()
+    for name, (model, section) in SEARCH_TYPES.items():
+        document = SEARCH_DOCUMENTS[model.__table__.name]
+        columns = ('id', 'title', 'description') + tuple(
+            column for column, weight in document if column not in ('title', 'description')
+        )
+        for row in read_rows(model, columns):
+            weighted_texts = []
+            for column, weight in document:
+                value = getattr(row, column)
+                weighted_texts.append((' '.join(value) if isinstance(value, list) else value, weight))
+            index.add(name, row.id, row.title, row.description, weighted_texts)
+    return index
+
+
+def search(q, types, limit):
+    """Return ranked results with highlighted snippets for q across the given types"""
+    if db.engine.dialect.name == 'postgresql':
+        return search_postgres(q, types, limit)
+
+    sections = tuple(section for model, section in SEARCH_TYPES.values())
+    index = get_snapshot('search-index', sections, build_search_index)
+    return index.search(q, set(types), limit)
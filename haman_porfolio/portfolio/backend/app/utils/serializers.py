@@ -0,0 +1,122 @@
+from functools import lru_cache
+from marshmallow import Schema, fields, utils
+
+
+# marshmallow's Schema.dump() looks up and formats every field through several
+# method calls per value. compile_schema() turns a schema into one generated
+# function doing the same work inline, e.g. for SkillSchema:
+#
+#     def dump_SkillSchema(obj):
+#         v0 = obj.id
+#         v1 = obj.name
+#         v2 = obj.level
+#         return {'id': ..., 'name': ..., 'level': ...}
+#
+# Anything the generated code does not handle exactly as marshmallow does
+# (hooks, custom fields, missing attributes) goes back to Schema.dump().
+
+_text = utils.ensure_text_type
+
+
+def _can_compile(schema):
+    return schema.dict_class is dict and not any(schema._hooks.values())
+
+
+def _value_expr(field, var, namespace, depth=0):
+    """Return a Python expression serializing `var` as field._serialize() would"""
+    # Subclasses such as Email and Url format values exactly like String
+    if isinstance(field, fields.String) and type(field)._serialize is fields.String._serialize:
+        return f"({var} if {var} is None or {var}.__class__ is str else _text({var}))"
+    if type(field) is fields.Integer and not field.as_string:
+        return f"({var} if {var} is None or {var}.__class__ is int else int({var}))"
+    if type(field) is fields.DateTime and field.SERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT) is utils.isoformat:
+        return f"(None if {var} is None else {var}.isoformat())"
+    if type(field) is fields.List:
+        item = f"i{depth}"
+        inner = _value_expr(field.inner, item, namespace, depth + 1)
+        return f"(None if {var} is None else [{inner} for {item} in {var}])"
+    if type(field) is fields.Dict and field.mapping_type is dict:
+        if field.key_field is None and field.value_field is None:
+            return f"(None if {var} is None else dict({var}))"
+        if field.key_field is not None and field.value_field is not None:
+            key, value = f"k{depth}", f"i{depth}"
+            key_expr = _value_expr(field.key_field, key, namespace, depth + 1)
+            value_expr = _value_expr(field.value_field, value, namespace, depth + 1)
+            return f"(None if {var} is None else {{{key_expr}: {value_expr} for {key}, {value} in {var}.items()}})"
+    if type(field) is fields.Nested and _can_compile(field.schema):
+        name = f"_nested{len(namespace)}"
+        namespace[name] = compile_schema(field.schema)
+        if field.schema.many or field.many:
+            item = f"i{depth}"
+            return f"(None if {var} is None else [{name}({item}) for {item} in {var}])"
+        return f"(None if {var} is None else {name}({var}))"
+
+    # Anything else is formatted by the field itself
+    name = f"_field{len(namespace)}"
+    namespace[name] = field
+    return f"{name}._serialize({var}, None, obj)"
+
+
+def _generate(schema, access):
+    """Generate a dump function reading values with attribute or key access"""
+    namespace = {'_text': _text}
+    lines = [f"def dump_{type(schema).__name__}(obj):"]
+    items = []
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        key = field.data_key if field.data_key is not None else name
+        var = f"v{index}"
+        if access == 'item':
+            lines.append(f"    {var} = obj[{attribute!r}]")
+        else:
+            lines.append(f"    {var} = obj.{attribute}")
+        items.append(f"{key!r}: {_value_expr(field, var, namespace)}")
+    lines.append(f"    return {{{', '.join(items)}}}")
+
+    exec(compile('\n'.join(lines), f"<serializer {type(schema).__name__}>", 'exec'), namespace)
+    return namespace[f"dump_{type(schema).__name__}"]
+
+
+@lru_cache(maxsize=512)
+def compile_schema(schema):
+    """Return a function dumping one object exactly as schema.dump() would.
+
+    Plain dicts (the aggregated portfolio document) are read by key and
+    anything else (ORM objects, read-model records) by attribute. When a value
+    is missing, or the schema can't be compiled, schema.dump() does the work.
+    """
+    single = lambda obj: Schema.dump(schema, obj, many=False)
+    if not _can_compile(schema) or not all((field.attribute or name).isidentifier() for name, field in schema.dump_fields.items()):
+        return single
+
+    by_attribute = _generate(schema, 'attribute')
+    by_key = _generate(schema, 'item')
+
+    def dump_one(obj):
+        try:
+            if obj.__class__ is dict:
+                return by_key(obj)
+            return by_attribute(obj)
+        except (KeyError, AttributeError):
+            # e.g. a column left out of the row; marshmallow omits the field
+            return single(obj)
+
+    return dump_one
+
+
+def dump(schema, obj):
+    """Drop-in replacement for schema.dump(obj) using the compiled serializer"""
+    if obj is None:
+        return schema.dump(obj)
+    dump_one = compile_schema(schema)
+    if schema.many:
+        return [dump_one(item) for item in obj]
+    return dump_one(obj)
+
+
+def precompile():
+    """Compile the serializers of every shared schema instance in app.models"""
+    from app import models
+    for value in vars(models).values():
+        if isinstance(value, Schema):
+            compile_schema(value)
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import hmac
+import os
+import time
+from urllib.parse import quote
+
+
+SIGNED_URL_SECRET = os.environ.get('SIGNED_URL_SECRET') or os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
+# Path prefix signed links are issued under; a proxy can serve this prefix directly
+SIGNED_URL_PREFIX = os.environ.get('SIGNED_URL_PREFIX', '/files')
+# Public origin of signed links, e.g. https://api.example.com. When unset, links are
+# root-relative and the frontend resolves them against its API URL; the request's
+# Host header is never used, as clients control it.
+SIGNED_URL_BASE = os.environ.get('SIGNED_URL_BASE', '').rstrip('/')
+# hmac (HMAC-SHA256, checked by the app or a scripted proxy) or nginx (ngx_http_secure_link_module)
+SIGNED_URL_FORMAT = os.environ.get('SIGNED_URL_FORMAT', 'hmac').lower()
+# Minimum lifetime of a link, in seconds
+SIGNED_URL_TTL = int(os.environ.get('SIGNED_URL_TTL', 3600))
+# Expiry times are rounded up to a multiple of this, so every link issued within
+# one window is identical and responses embedding links can be cached for it
+SIGNED_URL_WINDOW = int(os.environ.get('SIGNED_URL_WINDOW', 900))
+
+
+def signing_window(now=None):
+    """Return the index of the current signing window"""
+    now = time.time() if now is None else now
+    return int(now // SIGNED_URL_WINDOW)
+
+
+def window_expiry(window):
+    """Return the expiry timestamp of links issued during the given window"""
+    return (window + 1) * SIGNED_URL_WINDOW + SIGNED_URL_TTL
+
+
+def _b64(digest):
+    return base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+
+
+def compute_signature(uri, expires):
+    """Sign a URI path and expiry timestamp"""
+    if SIGNED_URL_FORMAT == 'nginx':
+        # Matches: secure_link_md5 "$secure_link_expires$uri $secret";
+        return _b64(hashlib.md5(f"{expires}{uri} {SIGNED_URL_SECRET}".encode('utf-8')).digest())
+    message = f"{expires}:{uri}".encode('utf-8')
+    return _b64(hmac.new(SIGNED_URL_SECRET.encode('utf-8'), message, hashlib.sha256).digest())
+
+
+def sign_path(relative_path, window=None):
+    """Return a signed link to a file below the upload root, on SIGNED_URL_BASE if set"""
+    if window is None:
+        window = signing_window()
+    expires = window_expiry(window)
+    # The signature covers the decoded path, which is what proxies compare against
+    relative_path = relative_path.lstrip('/')
+    uri = f"{SIGNED_URL_PREFIX.rstrip('/')}/{relative_path}"
+    signature = compute_signature(uri, expires)
+    return f"{SIGNED_URL_BASE}{SIGNED_URL_PREFIX.rstrip('/')}/{quote(relative_path)}?expires={expires}&signature={signature}"
+
+
+def verify_signature(uri, expires, signature):
+    """Return None if a signed link is valid, otherwise the reason it is not"""
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return "Invalid link"
+    if not signature or not hmac.compare_digest(compute_signature(uri, expires), signature):
+        return "Invalid link"
+    if expires < time.time():
+        return "Link expired"
+    return None
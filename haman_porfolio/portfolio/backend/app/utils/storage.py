@@ -0,0 +1,273 @@
+import glob
+import hashlib
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from app.models import db, Certification, ImageAsset, Project, Resume, Testimonial
+from app.utils.file_serving import UPLOAD_ROOT
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+
+# Uploaded files are stored once per distinct content, as
+# blobs/<2 hex>/<2 hex>/<sha256><ext>, and shared by every record that uses them
+BLOB_FOLDER = os.path.join(UPLOAD_ROOT, 'blobs')
+BLOB_TMP_FOLDER = os.path.join(BLOB_FOLDER, 'tmp')
+# Blobs that may have lost their last reference are appended here for gc_uploads.py
+BLOB_GC_JOURNAL = os.path.join(BLOB_FOLDER, 'gc-journal')
+# Held shared while a blob is stored or reused and exclusively while the GC deletes one
+BLOB_STORE_LOCK = os.path.join(BLOB_FOLDER, 'lock')
+# Blobs written or reused more recently than this are never collected, which
+# covers uploads whose database row has not been committed yet
+BLOB_GC_GRACE_PERIOD = float(os.environ.get('BLOB_GC_GRACE_PERIOD', 3600))
+
+# Certification.url of a certificate uploaded to this server
+CERTIFICATE_URL_PREFIX = '/api/certificates/'
+# Project.image / Testimonial.avatar of an image uploaded to this server
+IMAGE_URL_PREFIX = '/api/images/'
+
+COPY_CHUNK_SIZE = 64 * 1024
+BLOB_NAME_PATTERN = re.compile(r'^[0-9a-f]{64}(\.[a-z0-9]{1,10})?$')
+
+
+def is_blob_name(name):
+    """Return True if name looks like a blob stored by store_blob"""
+    return bool(name) and BLOB_NAME_PATTERN.match(name) is not None
+
+
+def blob_path(name):
+    """Return the sharded location of a blob"""
+    return os.path.join(BLOB_FOLDER, name[:2], name[2:4], name)
+
+
+def journal_blob(name, queued_at=None):
+    """Record that a blob may be unreferenced, so the next GC run checks it"""
+    if not is_blob_name(name):
+        return
+    queued_at = time.time() if queued_at is None else queued_at
+    os.makedirs(BLOB_FOLDER, exist_ok=True)
+    # A single short O_APPEND write is not interleaved with other workers' writes
+    with open(BLOB_GC_JOURNAL, 'a') as journal:
+        journal.write(f"{int(queued_at)} {name}\n")
+
+
+@contextmanager
+def blob_store_lock(exclusive=False):
+    """Hold the blob store lock across every worker on the host.
+
+    Uploads share it; the GC takes it exclusively, so a blob can't be reused
+    between the GC's last look at it and its deletion.
+    """
+    os.makedirs(BLOB_FOLDER, exist_ok=True)
+    with open(BLOB_STORE_LOCK, 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _place_blob(name, move):
+    """Put a blob in its sharded location with move(target), unless it is already stored"""
+    target = blob_path(name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with blob_store_lock():
+        if os.path.exists(target):
+            # Refresh the mtime so a pending GC run treats the blob as in use
+            os.utime(target)
+            return False
+        move(target)
+    return True
+
+
+def store_blob(file, extension=None):
+    """Store an uploaded file (a werkzeug FileStorage or binary file object) by content.
+
+    Uploads streamed through uploads.HashingUploadFile are already hashed and
+    sitting in the blob store's temporary folder, so they are just renamed into
+    place and take the extension of their detected type. Anything else is
+    copied to a temporary file while it is hashed first. Readers never see a
+    partial blob, and content that is already stored is reused. Returns the
+    blob name.
+    """
+    stream = getattr(file, 'stream', file)
+    if hasattr(stream, 'claim'):
+        name = stream.hexdigest() + (extension if extension is not None else stream.extension).lower()
+        _place_blob(name, stream.claim)
+        journal_blob(name)
+        return name
+
+    os.makedirs(BLOB_TMP_FOLDER, exist_ok=True)
+    digest = hashlib.sha256()
+    handle, temp_path = tempfile.mkstemp(dir=BLOB_TMP_FOLDER)
+    try:
+        with os.fdopen(handle, 'wb') as temp:
+            for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                temp.write(chunk)
+
+        name = digest.hexdigest() + (extension or '').lower()
+
+        def move(target):
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, target)
+
+        _place_blob(name, move)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # Until the referencing row is committed the blob is a GC candidate like any other
+    journal_blob(name)
+    return name
+
+
+def adopt_blob(path, extension=''):
+    """Move a finished file on the same filesystem into the store; returns the blob name"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    name = digest.hexdigest() + extension.lower()
+
+    def move(target):
+        os.chmod(path, 0o644)
+        os.replace(path, target)
+
+    if not _place_blob(name, move):
+        os.remove(path)
+    journal_blob(name)
+    return name
+
+
+def delete_blob(name):
+    """Remove a blob, and any resized copies of it, from disk (the caller has checked nothing references it)"""
+    path = blob_path(name)
+    derivatives = glob.glob(os.path.join(os.path.dirname(path), name.split('.')[0] + '_*w.webp'))
+    for file_path in [path] + derivatives:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
+def blob_age(name):
+    """Return the seconds since a blob was written or last reused, or None if it is gone"""
+    try:
+        return time.time() - os.stat(blob_path(name)).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def count_blob_references(name):
+    """Count the certifications, resumes, projects and testimonials that point at a blob
+
+    An ImageAsset row only tracks an image's resized copies, so it is not a
+    reference; it is deleted along with the blob.
+    """
+    certifications = Certification.query.filter(Certification.url == CERTIFICATE_URL_PREFIX + name).count()
+    resumes = Resume.query.filter(Resume.filepath.like(f"%{name}")).count()
+    projects = Project.query.filter(Project.image == IMAGE_URL_PREFIX + name).count()
+    testimonials = Testimonial.query.filter(Testimonial.avatar == IMAGE_URL_PREFIX + name).count()
+    return certifications + resumes + projects + testimonials
+
+
+def _read_journal(path):
+    entries = {}
+    with open(path) as journal:
+        for line in journal:
+            try:
+                queued_at, name = line.split()
+                queued_at = float(queued_at)
+            except ValueError:
+                continue
+            entries[name] = max(queued_at, entries.get(name, queued_at))
+    return entries
+
+
+def collect_garbage(limit=None):
+    """Delete journaled blobs that are no longer referenced; returns (deleted, kept)
+
+    Only blobs named in the journal are examined, so a run costs time in
+    proportion to the uploads and deletions since the last one rather than
+    the size of the store. Candidates still inside the grace period, and any
+    beyond limit, are put back in the journal for a later run.
+    """
+    processing = BLOB_GC_JOURNAL + '.processing'
+    if not os.path.exists(processing):
+        # An interrupted run leaves its batch behind; otherwise take the current journal
+        if not os.path.exists(BLOB_GC_JOURNAL):
+            return 0, 0
+        os.replace(BLOB_GC_JOURNAL, processing)
+
+    entries = _read_journal(processing)
+    deleted, deferred = 0, []
+    for index, (name, queued_at) in enumerate(sorted(entries.items(), key=lambda item: item[1])):
+        if limit is not None and index >= limit:
+            deferred.append((name, queued_at))
+            continue
+
+        age = blob_age(name)
+        if age is None:
+            continue
+        if age < BLOB_GC_GRACE_PERIOD or time.time() - queued_at < BLOB_GC_GRACE_PERIOD:
+            deferred.append((name, queued_at))
+            continue
+        with blob_store_lock(exclusive=True):
+            # An upload may have reused the blob since the age check above; under the
+            # lock its mtime is current and no upload can touch it until the delete is done
+            age = blob_age(name)
+            if age is None:
+                continue
+            if age < BLOB_GC_GRACE_PERIOD:
+                deferred.append((name, queued_at))
+                continue
+            if count_blob_references(name) == 0:
+                delete_blob(name)
+                ImageAsset.query.filter(ImageAsset.original == name).delete(synchronize_session=False)
+                db.session.commit()
+                deleted += 1
+
+    for name, queued_at in deferred:
+        journal_blob(name, queued_at)
+    os.remove(processing)
+    remove_stale_temp_files()
+    return deleted, len(deferred)
+
+
+def remove_stale_temp_files():
+    """Delete temporary files left behind by uploads that crashed mid-copy"""
+    if not os.path.isdir(BLOB_TMP_FOLDER):
+        return
+    cutoff = time.time() - BLOB_GC_GRACE_PERIOD
+    for filename in os.listdir(BLOB_TMP_FOLDER):
+        path = os.path.join(BLOB_TMP_FOLDER, filename)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            continue
+
+
+def sweep_all_blobs():
+    """Journal every stored blob, so the next GC run checks the whole store
+
+    Use after restoring a backup or editing the database by hand.
+    """
+    count = 0
+    for directory, _, filenames in os.walk(BLOB_FOLDER):
+        if directory == BLOB_TMP_FOLDER:
+            continue
+        for filename in filenames:
+            if is_blob_name(filename):
+                # Only the blob's own mtime holds these back, not the time they were queued
+                journal_blob(filename, queued_at=0)
+                count += 1
+    return count
@@ -0,0 +1,182 @@
+import json
+import os
+import re
+import secrets
+import shutil
+import time
+from contextlib import contextmanager
+from app.utils.storage import BLOB_FOLDER, adopt_blob
+from app.utils.uploads import FILE_EXTENSIONS, HEADER_SIZE, UPLOAD_POLICIES, detect_file_type
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+
+# Partial uploads live next to the blob store, so a finished one is moved in with a rename
+UPLOAD_SESSION_FOLDER = os.path.join(BLOB_FOLDER, 'sessions')
+# Largest chunk accepted by a single PATCH request
+UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('UPLOAD_CHUNK_MAX_SIZE', 8 * 1024 * 1024))
+# Unfinished uploads are removed by gc_uploads.py after this many seconds
+UPLOAD_SESSION_TTL = float(os.environ.get('UPLOAD_SESSION_TTL', 86400))
+
+COPY_CHUNK_SIZE = 64 * 1024
+SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class SessionBusy(Exception):
+    """Another request is writing to the same upload session"""
+
+
+def _session_dir(upload_id):
+    if not SESSION_ID_PATTERN.match(upload_id or ''):
+        return None
+    return os.path.join(UPLOAD_SESSION_FOLDER, upload_id)
+
+
+def _data_path(directory):
+    return os.path.join(directory, 'data')
+
+
+def _save_meta(directory, meta):
+    temp_path = os.path.join(directory, 'meta.json.tmp')
+    with open(temp_path, 'w') as handle:
+        json.dump(meta, handle)
+    os.replace(temp_path, os.path.join(directory, 'meta.json'))
+
+
+def create_session(kind, size, filename=None):
+    """Start a resumable upload of `size` bytes; returns the session"""
+    upload_id = secrets.token_hex(16)
+    directory = _session_dir(upload_id)
+    os.makedirs(directory)
+    open(_data_path(directory), 'wb').close()
+
+    meta = {
+        'id': upload_id,
+        'kind': kind,
+        'size': size,
+        'filename': filename,
+        'file_type': None,
+        'created_at': time.time(),
+    }
+    _save_meta(directory, meta)
+    meta['offset'] = 0
+    return meta
+
+
+def load_session(upload_id):
+    """Return an upload session with its current offset, or None if it does not exist"""
+    directory = _session_dir(upload_id)
+    if directory is None:
+        return None
+    try:
+        with open(os.path.join(directory, 'meta.json')) as handle:
+            meta = json.load(handle)
+        meta['offset'] = os.path.getsize(_data_path(directory))
+    except (OSError, ValueError):
+        return None
+    return meta
+
+
+@contextmanager
+def locked_session(upload_id):
+    """Hold an upload session exclusively; yields the session, or None if it does not exist.
+
+    Raises SessionBusy if another request (in any worker) holds it.
+    """
+    directory = _session_dir(upload_id)
+    if directory is None or not os.path.isdir(directory):
+        yield None
+        return
+
+    with open(os.path.join(directory, 'lock'), 'a') as lock:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise SessionBusy()
+        try:
+            # Re-read under the lock, the offset may have moved while waiting
+            yield load_session(upload_id)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def append_chunk(meta, stream, length):
+    """Append up to `length` bytes from stream to the session and return the new offset.
+
+    The body is copied in small pieces, so memory use does not depend on the
+    chunk size. If the client disconnects part way, whatever arrived is kept
+    and the client resumes from the offset it reads back.
+    """
+    directory = _session_dir(meta['id'])
+    remaining = length
+    try:
+        with open(_data_path(directory), 'ab') as data:
+            while remaining > 0:
+                chunk = stream.read(min(COPY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                data.write(chunk)
+                remaining -= len(chunk)
+    finally:
+        meta['offset'] = os.path.getsize(_data_path(directory))
+    return meta['offset']
+
+
+def check_session_type(meta):
+    """Identify the upload from its first bytes once enough have arrived.
+
+    Returns False if they don't match any type accepted for the session's kind.
+    """
+    if meta['file_type'] is not None or meta['offset'] < min(HEADER_SIZE, meta['size']):
+        return True
+
+    directory = _session_dir(meta['id'])
+    with open(_data_path(directory), 'rb') as data:
+        header = data.read(HEADER_SIZE)
+    meta['file_type'] = detect_file_type(header, UPLOAD_POLICIES[meta['kind']]['types'])
+    if meta['file_type'] is None:
+        return False
+    _save_meta(directory, {key: value for key, value in meta.items() if key != 'offset'})
+    return True
+
+
+def finish_session(meta):
+    """Move a complete upload into the blob store and remove the session; returns the blob name"""
+    directory = _session_dir(meta['id'])
+    name = adopt_blob(_data_path(directory), FILE_EXTENSIONS.get(meta['file_type'], ''))
+    shutil.rmtree(directory, ignore_errors=True)
+    return name
+
+
+def delete_session(upload_id):
+    """Discard an upload session and everything received so far"""
+    directory = _session_dir(upload_id)
+    if directory is not None:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def remove_expired_sessions():
+    """Delete upload sessions older than UPLOAD_SESSION_TTL; returns how many were removed"""
+    if not os.path.isdir(UPLOAD_SESSION_FOLDER):
+        return 0
+    cutoff = time.time() - UPLOAD_SESSION_TTL
+    removed = 0
+    for upload_id in os.listdir(UPLOAD_SESSION_FOLDER):
+        meta = load_session(upload_id)
+        if meta is not None:
+            created_at = meta['created_at']
+        else:
+            # Unreadable or half-created session, judge it by its directory
+            try:
+                created_at = os.stat(os.path.join(UPLOAD_SESSION_FOLDER, upload_id)).st_mtime
+            except OSError:
+                continue
+        if created_at < cutoff:
+            delete_session(upload_id)
+            removed += 1
+    return removed
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import tempfile
+from functools import wraps
+from flask import Request, request
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+from app.utils.storage import BLOB_TMP_FOLDER
+
+
+MB = 1024 * 1024
+
+# Hard cap on any request body; werkzeug rejects larger bodies before reading them
+MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', 16 * MB))
+
+# Per-route limits on the uploaded file and the file types accepted, told apart by their magic bytes
+UPLOAD_POLICIES = {
+    'certificate': {
+        'max_size': int(os.environ.get('CERTIFICATE_MAX_SIZE', 10 * MB)),
+        'types': ('pdf', 'png', 'jpeg', 'webp'),
+    },
+    'resume': {
+        'max_size': int(os.environ.get('RESUME_MAX_SIZE', 10 * MB)),
+        'types': ('pdf',),
+    },
+    'image': {
+        'max_size': int(os.environ.get('IMAGE_MAX_SIZE', 10 * MB)),
+        'types': ('png', 'jpeg', 'webp'),
+    },
+}
+
+FILE_SIGNATURES = {
+    'pdf': lambda header: header.startswith(b'%PDF-'),
+    'png': lambda header: header.startswith(b'\x89PNG\r\n\x1a\n'),
+    'jpeg': lambda header: header.startswith(b'\xff\xd8\xff'),
+    'webp': lambda header: header[:4] == b'RIFF' and header[8:12] == b'WEBP',
+}
+FILE_EXTENSIONS = {'pdf': '.pdf', 'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+HEADER_SIZE = 16
+
+
+def detect_file_type(header, allowed):
+    """Return which of the allowed types the first bytes of a file belong to, or None"""
+    for file_type in allowed:
+        if FILE_SIGNATURES[file_type](header):
+            return file_type
+    return None
+
+
+class HashingUploadFile:
+    """Temporary file an uploaded file part is streamed into.
+
+    Every chunk is hashed and counted as werkzeug's form parser writes it,
+    and the upload is aborted as soon as it exceeds the size limit or its
+    first bytes don't match an allowed file type. An unclaimed file is
+    deleted when the request closes it.
+    """
+
+    def __init__(self, max_size, types):
+        self.max_size = max_size
+        self.types = types
+        self.size = 0
+        self.file_type = None
+        self._header = b''
+        self._digest = hashlib.sha256()
+        # Created inside the blob store so the finished file can be renamed into it
+        os.makedirs(BLOB_TMP_FOLDER, exist_ok=True)
+        handle, self.path = tempfile.mkstemp(dir=BLOB_TMP_FOLDER)
+        self._file = os.fdopen(handle, 'w+b')
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise RequestEntityTooLarge(f"File exceeds the {self.max_size // MB} MB limit")
+
+        if self.file_type is None and self.types is not None:
+            self._header += data[:HEADER_SIZE]
+            if len(self._header) >= HEADER_SIZE:
+                self.check_type()
+
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def check_type(self):
+        """Identify the file from its first bytes, raising if it is not an allowed type"""
+        if self.file_type is None and self.types is not None:
+            self.file_type = detect_file_type(self._header[:HEADER_SIZE], self.types)
+            if self.file_type is None:
+                raise UnsupportedMediaType(f"Only {', '.join(self.types)} files are accepted")
+        return self.file_type
+
+    @property
+    def extension(self):
+        return FILE_EXTENSIONS.get(self.check_type(), '')
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+    def claim(self, target):
+        """Move the finished upload to target; the temporary file then belongs to the caller"""
+        self._file.close()
+        os.chmod(self.path, 0o644)
+        os.replace(self.path, target)
+        self.path = None
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+            self.path = None
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush go straight to the temporary file
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Request class that streams uploaded files through HashingUploadFile"""
+
+    # Set by accept_upload() for the routes that take files
+    upload_policy = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        policy = self.upload_policy
+        if policy is None:
+            stream = HashingUploadFile(MAX_UPLOAD_SIZE, None)
+        else:
+            stream = HashingUploadFile(policy['max_size'], policy['types'])
+        # Kept here too, since a part rejected mid-stream never reaches request.files
+        self.__dict__.setdefault('_upload_streams', []).append(stream)
+        return stream
+
+    def close(self):
+        super().close()
+        for stream in self.__dict__.get('_upload_streams', ()):
+            stream.close()
+
+
+def accept_upload(name):
+    """Decorator applying the named upload policy to a route.
+
+    Requests whose declared length is already over the limit are turned away
+    before any of the body is read.
+    """
+    policy = UPLOAD_POLICIES[name]
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Leave room for the multipart framing and the other form fields
+            if request.content_length is not None and request.content_length > policy['max_size'] + MB:
+                return {"message": f"File exceeds the {policy['max_size'] // MB} MB limit"}, 413
+            request.upload_policy = policy
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
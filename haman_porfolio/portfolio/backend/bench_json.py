@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+JSON serialization benchmark
+
+Times how long one API response takes to encode with Flask-RESTful's stock
+json.dumps representation and with the provider in app/utils/json_provider.py.
+Uses the bundled sample portfolio, so no database is needed:
+
+    python bench_json.py --number 2000
+    JSON_BACKEND=stdlib python bench_json.py
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_restful.representations.json import output_json as restful_output_json
+from app.utils.data import get_portfolio_data, get_projects_data
+from app.utils.json_provider import JSON_LIBRARY, output_json
+
+
+def sample_payloads():
+    """Documents shaped like the API's largest responses"""
+    portfolio = get_portfolio_data()
+    projects = {"projects": get_projects_data()}
+    # Admin inbox page: plain values only, as ContactMessagesAPI serializes them
+    started = datetime(2024, 1, 1, 9, 30)
+    messages = {
+        "messages": [
+            {
+                "id": index,
+                "name": f"Sender {index}",
+                "email": f"sender{index}@example.com",
+                "subject": "Project enquiry",
+                "message": "Hello, I would like to talk about a project. " * 8,
+                "created_at": (started + timedelta(minutes=index)).isoformat(),
+                "read": index % 3 == 0
+            }
+            for index in range(50)
+        ],
+        "next_cursor": "WyIyMDI0LTAxLTAxVDEwOjE5OjAwIiw1MF0"
+    }
+    return {"portfolio document": portfolio, "projects": projects, "contact messages (50)": messages}
+
+
+def run_benchmark(number):
+    app = Flask(__name__)
+    print(f"Encoder: {JSON_LIBRARY}, {number} responses per measurement")
+
+    with app.app_context():
+        for name, payload in sample_payloads().items():
+            before = min(timeit.repeat(lambda: restful_output_json(payload, 200), number=number, repeat=3)) / number
+            after = min(timeit.repeat(lambda: output_json(payload, 200), number=number, repeat=3)) / number
+            size = len(output_json(payload, 200).get_data())
+            print(
+                f"{name:<24} {size:>7} bytes  "
+                f"before {before * 1e6:8.1f} us  after {after * 1e6:8.1f} us  "
+                f"({before / after:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON response serialization cost")
+    parser.add_argument("--number", type=int, default=1000, help="Responses encoded per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.number)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Read-model benchmark
+
+Loads and serializes each public section the way the API used to, through
+Model.query.all(), and the way it does now, through Core selects into
+slotted records (app/utils/read_models.py). Reports time, peak memory
+allocated and garbage collector runs per request. Only reads from the
+database configured by DATABASE_URL:
+
+    python bench_read_models.py --number 50
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from app import create_app
+from app.models import db, Article, Certification, Education, Experience, Project, Service, Skill, Testimonial
+from app.models import articles_schema, certifications_schema, educations_schema, experiences_schema
+from app.models import projects_schema, services_schema, skills_schema, testimonials_schema
+from app.utils.queries import load_section
+from app.utils.read_models import schema_columns
+from app.utils.serializers import dump
+
+
+SECTIONS = [
+    ('skills', Skill, skills_schema),
+    ('projects', Project, projects_schema),
+    ('articles', Article, articles_schema),
+    ('experience', Experience, experiences_schema),
+    ('education', Education, educations_schema),
+    ('certifications', Certification, certifications_schema),
+    ('testimonials', Testimonial, testimonials_schema),
+    ('services', Service, services_schema),
+]
+
+
+def measure(request, number):
+    """Run request number times, ending the session after each like a real request would.
+
+    Returns (seconds per request, peak bytes allocated by one request, gc runs per request).
+    """
+    def one():
+        try:
+            return request()
+        finally:
+            db.session.remove()
+
+    one()  # warm up caches and the connection pool
+    gc.collect()
+    collections = sum(stat['collections'] for stat in gc.get_stats())
+    started = time.perf_counter()
+    for _ in range(number):
+        one()
+    elapsed = (time.perf_counter() - started) / number
+    collections = sum(stat['collections'] for stat in gc.get_stats()) - collections
+
+    tracemalloc.start()
+    one()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, collections / number
+
+
+def run_benchmark(number):
+    app = create_app()
+
+    with app.app_context():
+        for name, model, schema in SECTIONS:
+            rows = db.session.query(model).count()
+            db.session.remove()
+            before = measure(lambda: dump(schema, model.query.all()), number)
+            after = measure(lambda: dump(schema, load_section(model, schema_columns(schema))), number)
+            print(
+                f"{name:<15} {rows:>6} rows  "
+                f"time {before[0] * 1e3:7.2f} -> {after[0] * 1e3:7.2f} ms  "
+                f"peak {before[1] / 1024:8.1f} -> {after[1] / 1024:8.1f} KiB  "
+                f"gc runs {before[2]:.2f} -> {after[2]:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare ORM and read-model loading of the public sections")
+    parser.add_argument("--number", type=int, default=50, help="Requests per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.number)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Compiled serializer check and benchmark
+
+First proves that app/utils/serializers.py produces exactly what the
+marshmallow schemas in app/models.py do. It compares every shared schema,
+and a set of sparse fieldsets, on generated rows. Inputs are ORM objects
+and plain dicts, with and without missing values. Then it times both
+serializers on a portfolio with thousands of child rows. No database is
+needed:
+
+    python bench_serializers.py --rows 1000
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from marshmallow import Schema, fields
+from app import models
+from app.models import PortfolioSchema, portfolio_schema, projects_schema
+from app.utils.fieldsets import sparse_schema
+from app.utils.serializers import dump
+
+
+def sample_value(field, index, rng):
+    """A value for field, None about one time in five"""
+    if isinstance(field, fields.Nested):
+        return [sample_row(field.schema, child, rng) for child in range(rng.randint(0, 4))]
+    if rng.random() < 0.2:
+        return None
+    if isinstance(field, fields.Integer):
+        return index
+    if isinstance(field, fields.Boolean):
+        return rng.choice([True, False])
+    if isinstance(field, fields.DateTime):
+        return datetime(2024, 1, 1) + timedelta(seconds=rng.randint(0, 10 ** 8), microseconds=rng.randint(0, 999999))
+    if isinstance(field, fields.List):
+        return [f"item-{rng.randint(0, 99)}" for _ in range(rng.randint(0, 5))]
+    if isinstance(field, fields.Dict):
+        return {str(width): f"/api/images/{index}_{width}w.webp" for width in (320, 640, 1280)[:rng.randint(0, 3)]}
+    return rng.choice([f"text {index} é☃", "", "https://example.com/x"])
+
+
+def sample_row(schema, index, rng):
+    """Build one model instance for schema, with generated values"""
+    model = getattr(models, type(schema).__name__[:-len('Schema')])
+    values = {name: sample_value(field, index, rng) for name, field in schema.fields.items()}
+    return model(**values)
+
+
+def as_dict(row, schema):
+    """The row as a plain dict, like load_section() and the aggregated portfolio query return"""
+    result = {}
+    for name, field in schema.fields.items():
+        value = getattr(row, name)
+        if isinstance(field, fields.Nested):
+            value = [as_dict(child, field.schema) for child in value]
+        result[name] = value
+    return result
+
+
+def check_equivalence(rng, rows=25):
+    """Compare compiled and marshmallow output; returns how many comparisons were made"""
+    checked = 0
+    schemas = [value for value in vars(models).values() if isinstance(value, Schema)]
+    schemas += [sparse_schema(PortfolioSchema, only) for only in (('about',), ('contact',), ('id', 'name', 'projects'))]
+    schemas += [sparse_schema(type(projects_schema), ('image_srcset', 'title'), many=True)]
+
+    for schema in schemas:
+        samples = [sample_row(schema, index, rng) for index in range(rows)]
+        dicts = [as_dict(row, schema) for row in samples]
+        # A row missing a column, which marshmallow leaves out of the output
+        partial = dict(dicts[0])
+        partial.pop(next(iter(schema.dump_fields)))
+        inputs = [samples, dicts, dicts[1:] + [partial]] if schema.many else samples + dicts + [partial]
+
+        for obj in inputs:
+            expected = schema.dump(obj)
+            actual = dump(schema, obj)
+            if actual != expected or (isinstance(expected, dict) and list(actual) != list(expected)):
+                raise AssertionError(f"{type(schema).__name__} differs:\n  marshmallow {expected!r}\n  compiled    {actual!r}")
+            checked += 1
+    return checked
+
+
+def run_benchmark(rows, number):
+    rng = random.Random(42)
+    print(f"Equivalence: {check_equivalence(rng)} inputs identical to marshmallow")
+
+    portfolio = sample_row(portfolio_schema, 1, rng)
+    for name, field in PortfolioSchema().fields.items():
+        if isinstance(field, fields.Nested):
+            setattr(portfolio, name, [sample_row(field.schema, index, rng) for index in range(rows)])
+    projects = portfolio.projects
+    document = as_dict(portfolio, portfolio_schema)
+
+    cases = [
+        (f"portfolio, {rows * 7} child rows (ORM)", portfolio_schema, portfolio),
+        (f"portfolio, {rows * 7} child rows (dicts)", portfolio_schema, document),
+        (f"projects section, {rows} rows", projects_schema, projects),
+    ]
+    for name, schema, obj in cases:
+        before = min(timeit.repeat(lambda: schema.dump(obj), number=number, repeat=3)) / number
+        after = min(timeit.repeat(lambda: dump(schema, obj), number=number, repeat=3)) / number
+        print(f"{name:<38} marshmallow {before * 1e3:8.2f} ms  compiled {after * 1e3:7.2f} ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and time the compiled serializers")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per portfolio collection")
+    parser.add_argument("--number", type=int, default=5, help="Dumps per measurement")
+    args = parser.parse_args()
+
+    try:
+        run_benchmark(args.rows, args.number)
+    except AssertionError as e:
+        print(e)
+        sys.exit(1)
@@ -5,6 +5,7 @@ Clean up problematic data in the database
 
 from app import create_app
 from app.models import db, Skill, Education, Experience, Certification, Testimonial, Article, Project, Service
+from app.utils.cache import CONTENT_SECTIONS, mark_changed
 
 def clean_database():
     app = create_app()
@@ -88,7 +89,8 @@ def clean_database():
                 service.title = service.title.replace(problematic_text, "").strip() or "Cleaned Service"
         print(f"Cleaned {len(services_to_clean)} service records")
         
-        # Commit all changes
+        # Commit all changes and invalidate the cached documents of running workers
+        mark_changed(*CONTENT_SECTIONS)
         db.session.commit()
         print("Database cleanup completed successfully!")
 
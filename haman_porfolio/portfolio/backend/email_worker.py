@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Email outbox worker
+
+Delivers the emails queued in the email_outbox table. Several workers can
+run side by side; each claims its rows with SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+
+import argparse
+import os
+import time
+from app import create_app
+from app.models import db
+from app.utils.email import drain_outbox
+
+
+def run_worker(batch_size, poll_interval, once=False):
+    app = create_app()
+
+    with app.app_context():
+        while True:
+            try:
+                processed = drain_outbox(batch_size)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error draining email outbox: {str(e)}")
+                processed = 0
+            finally:
+                db.session.remove()
+
+            if once and processed < batch_size:
+                break
+            if processed < batch_size:
+                # Outbox is drained, wait for new emails
+                time.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver queued outbox emails")
+    parser.add_argument("--batch-size", type=int, default=int(os.environ.get("EMAIL_WORKER_BATCH_SIZE", 20)))
+    parser.add_argument("--poll-interval", type=float, default=float(os.environ.get("EMAIL_WORKER_POLL_INTERVAL", 5)))
+    parser.add_argument("--once", action="store_true", help="Exit once the outbox is drained")
+    args = parser.parse_args()
+
+    run_worker(args.batch_size, args.poll_interval, args.once)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Upload garbage collector
+
+Deletes stored blobs that no certification, resume, project or testimonial
+refers to any more (with the resized copies of images),
+and resumable uploads that were never finished.
+Each run only examines the blobs journaled since the previous one, so it is
+cheap enough to run from cron every few minutes.
+"""
+
+import argparse
+from app import create_app
+from app.utils.storage import collect_garbage, sweep_all_blobs
+from app.utils.upload_sessions import remove_expired_sessions
+
+
+def run_gc(limit=None, full=False):
+    app = create_app()
+
+    with app.app_context():
+        if full:
+            queued = sweep_all_blobs()
+            print(f"Queued {queued} stored blobs for checking")
+
+        deleted, deferred = collect_garbage(limit)
+        print(f"Deleted {deleted} unreferenced blobs, {deferred} left for a later run")
+
+        expired = remove_expired_sessions()
+        print(f"Removed {expired} abandoned resumable uploads")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete unreferenced uploaded files")
+    parser.add_argument("--limit", type=int, default=None, help="Check at most this many candidates")
+    parser.add_argument("--full", action="store_true", help="Check every stored blob, not just journaled ones")
+    args = parser.parse_args()
+
+    run_gc(args.limit, args.full)
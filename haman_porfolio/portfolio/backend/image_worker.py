@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Image derivative worker
+
+Makes the resized WebP copies of uploaded project images and testimonial
+avatars, so the API never resizes images while answering a request.
+Requires Pillow. Several workers can run side by side; each claims its
+rows with SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+
+import argparse
+import os
+import time
+from app import create_app
+from app.models import db
+from app.utils.images import process_pending_images
+
+
+def run_worker(batch_size, poll_interval, once=False):
+    app = create_app()
+
+    with app.app_context():
+        while True:
+            try:
+                processed = process_pending_images(batch_size)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error processing images: {str(e)}")
+                processed = 0
+            finally:
+                db.session.remove()
+
+            if once and processed < batch_size:
+                break
+            if processed < batch_size:
+                # Nothing left to resize, wait for new uploads
+                time.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate resized copies of uploaded images")
+    parser.add_argument("--batch-size", type=int, default=int(os.environ.get("IMAGE_WORKER_BATCH_SIZE", 5)))
+    parser.add_argument("--poll-interval", type=float, default=float(os.environ.get("IMAGE_WORKER_POLL_INTERVAL", 5)))
+    parser.add_argument("--once", action="store_true", help="Exit once every pending image is processed")
+    args = parser.parse_args()
+
+    run_worker(args.batch_size, args.poll_interval, args.once)
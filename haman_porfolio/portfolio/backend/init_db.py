@@ -1,6 +1,7 @@
 import os
 from app import create_app, db
 from app.models import Portfolio, Skill, Education, Experience, Certification, Testimonial, Article, Project, Service, ContactMessage, Resume
+from app.utils.cache import CONTENT_SECTIONS, mark_changed
 
 
 def init_db():
@@ -352,6 +353,8 @@ def init_db():
                 )
                 db.session.add(service)
         
+        # Invalidate the cached documents of running workers
+        mark_changed(*CONTENT_SECTIONS)
         db.session.commit()
         print("Database initialized successfully with default data!")
 
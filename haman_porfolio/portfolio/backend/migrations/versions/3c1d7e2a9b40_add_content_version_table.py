@@ -0,0 +1,37 @@
+"""Add content_version table
+
+Revision ID: 3c1d7e2a9b40
+Revises: 9fdbc40564c7
+Create Date: 2026-10-18 09:12:04.118305
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d7e2a9b40'
+down_revision = '9fdbc40564c7'
+branch_labels = None
+depends_on = None
+
+
+SECTIONS = ['portfolio', 'skills', 'education', 'experience', 'certifications',
+            'testimonials', 'articles', 'projects', 'services']
+
+
+def upgrade():
+    content_version = op.create_table('content_version',
+    sa.Column('section', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('section')
+    )
+    op.bulk_insert(content_version, [
+        {'section': section, 'version': 1, 'updated_at': datetime.utcnow()} for section in SECTIONS
+    ])
+
+
+def downgrade():
+    op.drop_table('content_version')
@@ -0,0 +1,138 @@
+"""Add typed starts_on/ends_on dates parsed from the free-text date columns
+
+Revision ID: 4d7a2c9e1b63
+Revises: e81b6f3a9c52
+Create Date: 2026-10-18 18:12:37.915374
+
+"""
+import calendar
+import re
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7a2c9e1b63'
+down_revision = 'e81b6f3a9c52'
+branch_labels = None
+depends_on = None
+
+
+# table: (start source column, end source column), as DATE_SOURCES in app/models.py
+DATE_SOURCES = {
+    'article': ('date', 'date'),
+    'certification': ('date', 'expires'),
+    'education': ('year', 'year'),
+    'experience': ('period', 'period'),
+    'project': ('year', 'year'),
+}
+
+
+# The date parser as of this revision (app/utils/dates.py), copied so later
+# changes to the app's parser do not change what this migration backfills
+
+MONTHS = {}
+for _number in range(1, 13):
+    MONTHS[calendar.month_name[_number].lower()] = _number
+    MONTHS[calendar.month_abbr[_number].lower()] = _number
+MONTHS['sept'] = 9
+
+OPEN_ENDED = {'present', 'current', 'now', 'ongoing', 'today'}
+
+RANGE_SEPARATOR = re.compile(r'\s*(?:–|—|\bto\b|\buntil\b|\s-\s|-(?=\s*[A-Za-z]|\d{4}\b))\s*', re.IGNORECASE)
+
+DATE_PATTERNS = (
+    (re.compile(r'^(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$'), 'day'),
+    (re.compile(r'^(?P<year>\d{4})-(?P<month>\d{1,2})$'), 'month'),
+    (re.compile(r'^(?P<month>\d{1,2})[/.](?P<year>\d{4})$'), 'month'),
+    (re.compile(r'^(?P<month_name>[A-Za-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})$'), 'day'),
+    (re.compile(r'^(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<month_name>[A-Za-z]+)\.?,?\s+(?P<year>\d{4})$'), 'day'),
+    (re.compile(r'^(?P<month_name>[A-Za-z]+)\.?,?\s+(?P<year>\d{4})$'), 'month'),
+    (re.compile(r'^(?P<year>\d{4})$'), 'year'),
+)
+
+
+def parse_date_bounds(text):
+    text = (text or '').strip().rstrip('.')
+    for pattern, precision in DATE_PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+
+        parts = match.groupdict()
+        year = int(parts['year'])
+        if parts.get('month_name'):
+            month = MONTHS.get(parts['month_name'].lower())
+            if month is None:
+                return None
+        else:
+            month = int(parts.get('month') or 1)
+
+        try:
+            if precision == 'year':
+                return date(year, 1, 1), date(year, 12, 31)
+            if precision == 'month':
+                return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+            day = date(year, month, int(parts['day']))
+            return day, day
+        except ValueError:
+            return None
+    return None
+
+
+def parse_date_range(text):
+    whole = parse_date_bounds(text)
+    if whole:
+        return whole
+
+    parts = RANGE_SEPARATOR.split((text or '').strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None, None
+
+    start = parse_date_bounds(parts[0])
+    if start is None:
+        return None, None
+    if parts[1].strip().lower() in OPEN_ENDED:
+        return start[0], None
+    end = parse_date_bounds(parts[1])
+    if end is None or end[1] < start[0]:
+        return None, None
+    return start[0], end[1]
+
+
+def upgrade():
+    connection = op.get_bind()
+
+    for table_name, (start_source, end_source) in DATE_SOURCES.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('starts_on', sa.Date(), nullable=True))
+            batch_op.add_column(sa.Column('ends_on', sa.Date(), nullable=True))
+
+        # Backfill from the free text; rows whose dates can't be parsed stay NULL
+        table = sa.table(
+            table_name,
+            sa.column('id', sa.Integer),
+            *[sa.column(source, sa.String) for source in dict.fromkeys((start_source, end_source))],
+            sa.column('starts_on', sa.Date),
+            sa.column('ends_on', sa.Date),
+        )
+        rows = connection.execute(sa.select(table.c.id, table.c[start_source], table.c[end_source])).fetchall()
+        for row_id, start_text, end_text in rows:
+            starts_on = parse_date_range(start_text)[0]
+            ends_on = parse_date_range(end_text)[1]
+            if starts_on is not None or ends_on is not None:
+                connection.execute(
+                    table.update().where(table.c.id == row_id).values(starts_on=starts_on, ends_on=ends_on)
+                )
+
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_index(f'ix_{table_name}_starts_on_ends_on', ['starts_on', 'ends_on'], unique=False)
+
+
+def downgrade():
+    for table_name in DATE_SOURCES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table_name}_starts_on_ends_on')
+            batch_op.drop_column('ends_on')
+            batch_op.drop_column('starts_on')
@@ -0,0 +1,54 @@
+"""Add image_asset table and srcset columns
+
+Revision ID: 5e8b2d7c4f19
+Revises: a92f4c6d1e07
+Create Date: 2026-10-18 15:02:41.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8b2d7c4f19'
+down_revision = 'a92f4c6d1e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('image_asset',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('original', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('derivatives', sa.JSON(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('original')
+    )
+    with op.batch_alter_table('image_asset', schema=None) as batch_op:
+        batch_op.create_index('ix_image_asset_status_created_at', ['status', 'created_at'], unique=False)
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_srcset', sa.JSON(), nullable=True))
+
+    with op.batch_alter_table('testimonial', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('avatar_srcset', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('testimonial', schema=None) as batch_op:
+        batch_op.drop_column('avatar_srcset')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('image_srcset')
+
+    with op.batch_alter_table('image_asset', schema=None) as batch_op:
+        batch_op.drop_index('ix_image_asset_status_created_at')
+
+    op.drop_table('image_asset')
@@ -0,0 +1,34 @@
+"""Index contact messages for keyset pagination
+
+Revision ID: 7b4e0f6c2d18
+Revises: 3c1d7e2a9b40
+Create Date: 2026-10-18 11:02:47.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b4e0f6c2d18'
+down_revision = '3c1d7e2a9b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset cursors compare (created_at, id), so created_at can't be NULL
+    op.execute("UPDATE contact_message SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    with op.batch_alter_table('contact_message', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=False)
+        batch_op.create_index('ix_contact_message_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('contact_message', schema=None) as batch_op:
+        batch_op.drop_index('ix_contact_message_created_at_id')
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=True)
@@ -0,0 +1,64 @@
+"""Add full-text search vectors to projects, articles, experience and services
+
+Revision ID: c3d9a1f7e254
+Revises: 5e8b2d7c4f19
+Create Date: 2026-10-18 16:41:09.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9a1f7e254'
+down_revision = '5e8b2d7c4f19'
+branch_labels = None
+depends_on = None
+
+
+# Weighted columns of each table's search_vector (as SEARCH_DOCUMENTS in app/models.py)
+SEARCH_DOCUMENTS = {
+    'project': "setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') || "
+               "setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B')",
+    'article': "setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') || "
+               "setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'A') || "
+               "setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B')",
+    'experience': "setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B')",
+    'service': "setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B')",
+}
+TRIGGER_COLUMNS = {
+    'project': 'title, description',
+    'article': 'title, tags, description',
+    'experience': 'description',
+    'service': 'description',
+}
+
+
+def upgrade():
+    for table, document in SEARCH_DOCUMENTS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {document};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(
+            f"CREATE TRIGGER {table}_search_vector_update "
+            f"BEFORE INSERT OR UPDATE OF {TRIGGER_COLUMNS[table]} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+        )
+        # Fire the trigger once for existing rows, then index the filled column
+        op.execute(f"UPDATE {table} SET description = description")
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    for table in SEARCH_DOCUMENTS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_using='gin')
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,32 @@
+"""Index project technologies and article tags for faceted filtering
+
+Revision ID: e81b6f3a9c52
+Revises: c3d9a1f7e254
+Create Date: 2026-10-18 17:26:53.771042
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81b6f3a9c52'
+down_revision = 'c3d9a1f7e254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index('ix_project_technologies', ['technologies'], unique=False, postgresql_using='gin')
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.create_index('ix_article_tags', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index('ix_article_tags', postgresql_using='gin')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_technologies', postgresql_using='gin')
@@ -5,7 +5,7 @@ Reset admin password script
 
 from app import create_app
 from app.models import db, AdminUser
-from werkzeug.security import generate_password_hash
+from app.utils.passwords import hash_password
 
 def reset_admin_password():
     app = create_app()
@@ -17,7 +17,7 @@ def reset_admin_password():
         if admin_user:
             # Reset the password to a known value
             new_password = "admin123"
-            admin_user.password_hash = generate_password_hash(new_password)
+            admin_user.password_hash = hash_password(new_password)
             db.session.commit()
             print(f"Password reset for admin user: {admin_user.email}")
             print(f"New password: {new_password}")
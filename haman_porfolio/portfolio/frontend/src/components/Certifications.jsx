@@ -1,4 +1,5 @@
 import React from "react";
+import { resolveApiUrl } from "../utils/api";
 import "../styles/Certifications.css";
 
 const Certifications = ({ certifications }) => {
@@ -19,9 +20,9 @@ const Certifications = ({ certifications }) => {
                 {cert.expires && <p><strong>Expires:</strong> {cert.expires}</p>}
                 <p><strong>Credential ID:</strong> {cert.credential_id}</p>
               </div>
-              {cert.url ? (
+              {cert.file_url || cert.url ? (
                 <a
-                  href={cert.url}
+                  href={cert.file_url ? resolveApiUrl(cert.file_url) : cert.url}
                   target="_blank"
                   rel="noopener noreferrer"
                   className="btn btn-primary"
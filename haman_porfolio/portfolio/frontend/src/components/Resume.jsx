@@ -1,13 +1,20 @@
 import React from "react";
+import { fetchResumeLink, resolveApiUrl } from "../utils/api";
 import "../styles/Resume.css";
 
 const Resume = () => {
-  const handleDownload = () => {
-    // In a real application, this would download the actual resume file
-    // For now, we'll create a simple PDF download using the CV file we already have
+  const handleDownload = async () => {
     const link = document.createElement("a");
-    link.href = "/Hamman_Muraya_DAVIS_STYLE_CV.pdf";
-    link.download = "Hamman_Muraya_Resume.pdf";
+    try {
+      // The uploaded resume, through a signed link to the backend
+      const { url, filename } = await fetchResumeLink();
+      link.href = resolveApiUrl(url);
+      link.download = filename;
+    } catch (error) {
+      // No resume uploaded yet: fall back to the CV bundled with the site
+      link.href = "/Hamman_Muraya_DAVIS_STYLE_CV.pdf";
+      link.download = "Hamman_Muraya_Resume.pdf";
+    }
     document.body.appendChild(link);
     link.click();
     document.body.removeChild(link);
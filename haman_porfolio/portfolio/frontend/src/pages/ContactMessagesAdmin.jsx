@@ -7,6 +7,8 @@ const ContactMessagesAdmin = () => {
   const { token } = useAuth();
   const navigate = useNavigate();
   const [messages, setMessages] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalMessages, setTotalMessages] = useState(0);
   const [loading, setLoading] = useState(true);
   const [message, setMessage] = useState("");
 
@@ -14,9 +16,11 @@ const ContactMessagesAdmin = () => {
     fetchMessagesData();
   }, []);
 
-  const fetchMessagesData = async () => {
+  // Fetch the first page, or the page after `cursor` when loading more
+  const fetchMessagesData = async (cursor = null) => {
     try {
-      const response = await fetch("http://localhost:5000/api/contact-messages", {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+      const response = await fetch(`http://localhost:5000/api/contact-messages${query}`, {
         headers: {
           "Authorization": `Bearer ${token}`,
         },
@@ -24,7 +28,10 @@ const ContactMessagesAdmin = () => {
 
       if (response.ok) {
         const data = await response.json();
-        setMessages(data.messages || []);
+        const page = data.messages || [];
+        setMessages((previous) => (cursor ? [...previous, ...page] : page));
+        setNextCursor(data.next_cursor || null);
+        setTotalMessages(data.approx_total || 0);
       } else {
         setMessage("Failed to load contact messages");
       }
@@ -71,7 +78,7 @@ const ContactMessagesAdmin = () => {
       {message && <div className={`message ${message.includes("successfully") ? "success" : "error"}`}>{message}</div>}
       
       <div className="item-list">
-        <h3>All Contact Messages</h3>
+        <h3>All Contact Messages {totalMessages > 0 && `(about ${totalMessages})`}</h3>
         {messages.length > 0 ? (
           messages.map((msg, index) => (
             <div key={msg.id || index} className="item-card">
@@ -96,6 +103,11 @@ const ContactMessagesAdmin = () => {
         ) : (
           <p>No contact messages received yet.</p>
         )}
+        {nextCursor && (
+          <button className="btn btn-primary" onClick={() => fetchMessagesData(nextCursor)}>
+            Load More
+          </button>
+        )}
       </div>
       
       <button className="btn btn-secondary" onClick={() => navigate("/admin")}>
@@ -1,6 +1,7 @@
 import React, { useState } from "react";
 import { useAuth } from "../contexts/AuthContext";
 import { useNavigate } from "react-router-dom";
+import { fetchResumeLink, resolveApiUrl } from "../utils/api";
 import "../styles/AdminForm.css";
 
 const ResumeAdmin = () => {
@@ -61,8 +62,13 @@ const ResumeAdmin = () => {
     }
   };
 
-  const handleDownload = () => {
-    window.open("http://localhost:5000/api/resume", "_blank");
+  const handleDownload = async () => {
+    try {
+      const { url } = await fetchResumeLink();
+      window.open(resolveApiUrl(url), "_blank");
+    } catch (error) {
+      setMessage("Error downloading resume: " + error.message);
+    }
   };
 
   return (
@@ -1,48 +1,53 @@
 const API_BASE_URL = process.env.REACT_APP_API_URL || "http://localhost:5000/api";
 
-// Fetch portfolio data
-export const fetchPortfolioData = async () => {
+// Resolve a link the backend returned (e.g. a root-relative signed file URL) against its origin
+export const resolveApiUrl = (url) =>
+  new URL(url, new URL(API_BASE_URL, window.location.href)).href;
+
+// Concurrent callers share one in-flight bootstrap request
+let bootstrapRequest = null;
+
+// Fetch every public section in a single request
+export const fetchBootstrapData = async () => {
+  if (!bootstrapRequest) {
+    bootstrapRequest = fetch(`${API_BASE_URL}/bootstrap`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error("Failed to fetch bootstrap data");
+        }
+        return response.json();
+      })
+      .finally(() => {
+        bootstrapRequest = null;
+      });
+  }
   try {
-    const response = await fetch(`${API_BASE_URL}/portfolio`);
-    if (!response.ok) {
-      throw new Error("Failed to fetch portfolio data");
-    }
-    return await response.json();
+    return await bootstrapRequest;
   } catch (error) {
-    console.error("Error fetching portfolio data:", error);
+    console.error("Error fetching bootstrap data:", error);
     throw error;
   }
 };
 
+// Fetch portfolio data
+export const fetchPortfolioData = async () => {
+  const data = await fetchBootstrapData();
+  return data.portfolio;
+};
+
 // Fetch projects data
 export const fetchProjectsData = async () => {
-  try {
-    const response = await fetch(`${API_BASE_URL}/projects`);
-    if (!response.ok) {
-      throw new Error("Failed to fetch projects data");
-    }
-    return await response.json();
-  } catch (error) {
-    console.error("Error fetching projects data:", error);
-    throw error;
-  }
+  const data = await fetchBootstrapData();
+  return { projects: data.projects || [] };
 };
 
 // Fetch experience data
 export const fetchExperienceData = async () => {
-  try {
-    const response = await fetch(`${API_BASE_URL}/experience`);
-    if (!response.ok) {
-      throw new Error("Failed to fetch experience data");
-    }
-    return await response.json();
-  } catch (error) {
-    console.error("Error fetching experience data:", error);
-    throw error;
-  }
+  const data = await fetchBootstrapData();
+  return { experience: data.experience || [] };
 };
 
-// Fetch certifications data
+// Fetch certifications data; uploaded certificates carry a signed file_url
 export const fetchCertificationsData = async () => {
   try {
     const response = await fetch(`${API_BASE_URL}/certifications`);
@@ -58,42 +63,32 @@ export const fetchCertificationsData = async () => {
 
 // Fetch testimonials data
 export const fetchTestimonialsData = async () => {
-  try {
-    const response = await fetch(`${API_BASE_URL}/testimonials`);
-    if (!response.ok) {
-      throw new Error("Failed to fetch testimonials data");
-    }
-    return await response.json();
-  } catch (error) {
-    console.error("Error fetching testimonials data:", error);
-    throw error;
-  }
+  const data = await fetchBootstrapData();
+  return { testimonials: data.testimonials || [] };
 };
 
 // Fetch articles data
 export const fetchArticlesData = async () => {
-  try {
-    const response = await fetch(`${API_BASE_URL}/articles`);
-    if (!response.ok) {
-      throw new Error("Failed to fetch articles data");
-    }
-    return await response.json();
-  } catch (error) {
-    console.error("Error fetching articles data:", error);
-    throw error;
-  }
+  const data = await fetchBootstrapData();
+  return { articles: data.articles || [] };
 };
 
 // Fetch services data
 export const fetchServicesData = async () => {
+  const data = await fetchBootstrapData();
+  return { services: data.services || [] };
+};
+
+// Fetch a signed, expiring download link for the uploaded resume
+export const fetchResumeLink = async () => {
   try {
-    const response = await fetch(`${API_BASE_URL}/services`);
+    const response = await fetch(`${API_BASE_URL}/resume/link`);
     if (!response.ok) {
-      throw new Error("Failed to fetch services data");
+      throw new Error("Failed to fetch resume link");
     }
     return await response.json();
   } catch (error) {
-    console.error("Error fetching services data:", error);
+    console.error("Error fetching resume link:", error);
     throw error;
   }
 };